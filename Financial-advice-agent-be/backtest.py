@@ -0,0 +1,184 @@
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+import price_store
+from bars import aggregate_bars
+from classes import TimeFrame
+from consts import top_crypto_dict
+from market_panel import MarketPanel
+from signals import (
+    BOLLINGER_WEIGHT,
+    BUY_MIN_SCORE,
+    DRIFT_WEIGHT,
+    FIFTY_PERCENT_WEEKS,
+    FIFTY_PERCENT_WEIGHT,
+    FORECAST_WEEKS,
+    FORECAST_Z,
+    RSI_WEIGHT,
+    SELL_MAX_SCORE,
+)
+
+# Weekly rows the request path hands to the signals (price_retriever keeps the last 24)
+HISTORY_WEEKS = 24
+
+
+def rolling(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """Applies `reducer` over a trailing window along the time axis, NaN until it is full."""
+    result = np.full_like(values, np.nan)
+    if len(values) >= window:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            result[window - 1 :] = reducer(sliding_window_view(values, window, axis=0), axis=-1)
+    return result
+
+
+def shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Shifts along the time axis; negative periods look into the future."""
+    result = np.full_like(values, np.nan)
+    if periods < 0:
+        result[:periods] = values[-periods:]
+    elif periods > 0:
+        result[periods:] = values[:-periods]
+    else:
+        result[:] = values
+    return result
+
+
+def panel_signals(panel: MarketPanel, history_weeks: int = HISTORY_WEEKS) -> dict:
+    """Evaluates the signals.py rules for every symbol and every week at once.
+
+    Returns:
+        A dictionary of (weeks x symbols) arrays: "trend" and "action" as -1/0/1,
+        "score" as 0-100, and "low", "mid", "high" forecast bands of shape
+        (len(FORECAST_WEEKS), weeks, symbols).
+    """
+    close, high, low = panel.fields["close"], panel.fields["high"], panel.fields["low"]
+    indicators = panel.indicators()
+
+    votes = sum(
+        np.nan_to_num(np.sign(fast - slow))
+        for fast, slow in (
+            (indicators["ma_50"], indicators["ma_200"]),
+            (close, indicators["ma_50"]),
+            (indicators["macd_histogram"], 0.0),
+        )
+    )
+    trend = np.where(votes >= 2, 1, np.where(votes <= -2, -1, 0))
+
+    components = [indicators["rsi"]]
+    weights = [RSI_WEIGHT]
+    band_width = indicators["bb_upper"] - indicators["bb_lower"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        position = np.clip((close - indicators["bb_lower"]) / band_width, 0, 1)
+        components.append(np.where(band_width > 0, 100 * position, np.nan))
+        weights.append(BOLLINGER_WEIGHT)
+        for weeks in FIFTY_PERCENT_WEEKS:
+            window = min(weeks, history_weeks)
+            range_high = rolling(high, window, np.nanmax)
+            range_low = rolling(low, window, np.nanmin)
+            spread = range_high - range_low
+            components.append(np.where(spread > 0, 100 * (close - range_low) / spread, np.nan))
+            weights.append(FIFTY_PERCENT_WEIGHT / len(FIFTY_PERCENT_WEEKS))
+    components = np.stack(components)
+    weights = np.array(weights)[:, None, None] * ~np.isnan(components)
+    with np.errstate(invalid="ignore"):
+        score = np.nansum(np.nan_to_num(components) * weights, axis=0) / weights.sum(axis=0)
+    score = np.round(np.where(weights.sum(axis=0) > 0, score, 50))
+    action = np.where(
+        (trend == 1) & (score >= BUY_MIN_SCORE), 1, np.where((trend == -1) & (score <= SELL_MAX_SCORE), -1, 0)
+    )
+
+    returns = np.log(close) - np.log(shift(close, 1))
+    drift = DRIFT_WEIGHT * rolling(returns, history_weeks - 1, np.mean)
+    volatility = rolling(returns, history_weeks - 1, lambda x, axis: np.std(x, axis=axis, ddof=1))
+    horizon = np.array(FORECAST_WEEKS, dtype=float)[:, None, None]
+    mid = close * np.exp(drift * horizon)
+    spread = FORECAST_Z * volatility * np.sqrt(horizon)
+    return {
+        "trend": np.where(np.isnan(close), np.nan, trend),
+        "score": np.where(np.isnan(close), np.nan, score),
+        "action": np.where(np.isnan(close), np.nan, action),
+        "low": mid * np.exp(-spread),
+        "mid": mid,
+        "high": mid * np.exp(spread),
+    }
+
+
+def hit_rate(predicted: np.ndarray, realized: np.ndarray, direction: int) -> float:
+    """Share of `direction` predictions followed by a move in that direction."""
+    mask = (predicted == direction) & ~np.isnan(realized)
+    return float(np.mean(np.sign(realized[mask]) == direction)) if mask.any() else float("nan")
+
+
+def evaluate(panel: MarketPanel, signals: dict, horizon: int = 4) -> dict:
+    """Scores the signals against what prices actually did afterwards.
+
+    Args:
+        panel: The weekly market panel.
+        signals: The output of panel_signals.
+        horizon: Weeks ahead the trend, action and score are judged on.
+
+    Returns:
+        A dictionary of summary metrics.
+    """
+    close = panel.fields["close"]
+    forward = shift(close, -horizon) / close - 1
+    directional = ~np.isnan(forward) & (signals["trend"] != 0)
+    trend_hits = np.sign(forward[directional]) == signals["trend"][directional]
+    valid = ~np.isnan(forward) & ~np.isnan(signals["score"])
+
+    metrics = {
+        "weeks": len(panel.dates),
+        "symbols": len(panel.symbols),
+        "trend_hit_rate": float(trend_hits.mean()) if trend_hits.size else float("nan"),
+        "up_hit_rate": hit_rate(signals["trend"], forward, 1),
+        "down_hit_rate": hit_rate(signals["trend"], forward, -1),
+        "buy_hit_rate": hit_rate(signals["action"], forward, 1),
+        "sell_hit_rate": hit_rate(signals["action"], forward, -1),
+        "score_return_correlation": float(np.corrcoef(signals["score"][valid], forward[valid])[0, 1]),
+    }
+    for i, weeks in enumerate(FORECAST_WEEKS):
+        actual = shift(close, -weeks)
+        mask = ~np.isnan(actual) & ~np.isnan(signals["mid"][i])
+        error = np.abs(signals["mid"][i][mask] / actual[mask] - 1)
+        inside = (actual[mask] >= signals["low"][i][mask]) & (actual[mask] <= signals["high"][i][mask])
+        metrics[f"forecast_mape_{weeks}w"] = float(error.mean())
+        metrics[f"band_coverage_{weeks}w"] = float(inside.mean())
+    return metrics
+
+
+def load_panel(symbols=None) -> MarketPanel:
+    """Builds the weekly panel from the local price store only, without the network."""
+    symbols = symbols or [symbol for symbol in top_crypto_dict if symbol != "NoCoin"]
+    return MarketPanel.from_frames(
+        {symbol: aggregate_bars(price_store.load(symbol), TimeFrame.WEEKLY) for symbol in symbols}
+    )
+
+
+def run_backtest(panel: MarketPanel, horizon: int = 4) -> dict:
+    return evaluate(panel, panel_signals(panel), horizon=horizon)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the price signals on the local price store")
+    parser.add_argument("--horizon", type=int, default=4, help="weeks ahead trend and actions are judged on")
+    parser.add_argument("symbols", nargs="*", help="tickers to include, all of them by default")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    panel = load_panel(args.symbols or None)
+    loaded = time.perf_counter()
+    metrics = run_backtest(panel, horizon=args.horizon)
+    done = time.perf_counter()
+
+    print(pd.Series(metrics).to_string(float_format=lambda value: f"{value:.3f}"))
+    print(f"loaded in {loaded - start:.2f}s, backtested in {done - loaded:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import threading
+
+import pandas as pd
+
+from classes import TimeFrame
+
+BAR_AGGREGATION = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+# Weeks end on Sunday and months on their last day, labelled by that last day
+BAR_OFFSETS = {
+    TimeFrame.WEEKLY: pd.offsets.Week(weekday=6),
+    TimeFrame.MONTHLY: pd.offsets.MonthEnd(),
+}
+PERIOD_NAMES = {TimeFrame.DAILY: "day", TimeFrame.WEEKLY: "week", TimeFrame.MONTHLY: "month"}
+
+
+def aggregate_bars(daily: pd.DataFrame, time_frame: TimeFrame) -> pd.DataFrame:
+    """Aggregates daily OHLCV bars into weekly or monthly bars."""
+    if time_frame == TimeFrame.DAILY:
+        return daily
+    bars = daily.resample(BAR_OFFSETS[time_frame]).agg(BAR_AGGREGATION)
+    return bars.dropna(subset=["close"])
+
+
+def update_bars(bars: pd.DataFrame, daily: pd.DataFrame, time_frame: TimeFrame) -> pd.DataFrame:
+    """Brings previously aggregated bars up to date with the daily history.
+
+    Only the last aggregated period, which may have been incomplete, and the periods
+    after it are aggregated again; the bars before it are kept as they are.
+
+    Args:
+        bars: Bars returned by aggregate_bars or update_bars before, or None.
+        daily: The current daily history, oldest first.
+        time_frame: WEEKLY or MONTHLY.
+
+    Returns:
+        The aggregated bars of the whole daily history.
+    """
+    if bars is None or bars.empty:
+        return aggregate_bars(daily, time_frame)
+    last_period = bars.index[-1]
+    period_start = last_period - BAR_OFFSETS[time_frame]
+    recent = aggregate_bars(daily[daily.index > period_start], time_frame)
+    return pd.concat([bars[bars.index < last_period], recent])
+
+
+class BarViews:
+    """Weekly and monthly bars of every ticker, materialised once per process.
+
+    Each view remembers the last daily bar it includes and is only updated
+    incrementally when the daily history moved on.
+    """
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, time_frame: TimeFrame, daily: pd.DataFrame) -> pd.DataFrame:
+        if time_frame == TimeFrame.DAILY or daily.empty:
+            return aggregate_bars(daily, time_frame)
+        last_daily = (daily.index[-1], daily["close"].iloc[-1])
+        key = (symbol, time_frame)
+        with self._lock:
+            view = self._views.get(key)
+            if view is not None and view[0] == last_daily:
+                return view[1]
+            bars = update_bars(view[1] if view is not None else None, daily, time_frame)
+            self._views[key] = (last_daily, bars)
+            return bars
+
+
+bar_views = BarViews()
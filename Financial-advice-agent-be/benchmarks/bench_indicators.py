@@ -0,0 +1,72 @@
+"""Incremental indicator engine against full pandas_ta recomputation on BTC history.
+
+Uses the daily BTC bars of the local price store when available, otherwise a
+synthetic random walk of the same length. Run from the project directory:
+
+    python benchmarks/bench_indicators.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import INDICATOR_COLUMNS, IndicatorEngine, compute_indicators
+from utils import add_indicators
+import price_store
+
+TOLERANCE = 1e-8
+NEW_BARS = 200
+
+
+def load_history() -> pd.DataFrame:
+    try:
+        df = price_store.load("BTC")
+        if not df.empty:
+            return df
+    except Exception as e:
+        print(f"Price store unavailable ({e}), using synthetic history")
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2014-09-17", periods=4000, freq="D")
+    close = 450 * np.exp(np.cumsum(rng.normal(0.001, 0.04, len(index))))
+    return pd.DataFrame(
+        {"open": close, "high": close * 1.02, "low": close * 0.98, "close": close, "volume": 1e9},
+        index=index,
+    )
+
+
+def main():
+    daily = load_history()
+    print(f"bars: {len(daily)}")
+
+    expected = add_indicators(daily)[INDICATOR_COLUMNS].to_numpy()
+    actual = compute_indicators(daily)[INDICATOR_COLUMNS].to_numpy()
+    scale = np.maximum(np.abs(expected), 1.0)
+    max_error = np.nanmax(np.abs(actual - expected) / scale)
+    same_nans = (np.isnan(actual) == np.isnan(expected)).all()
+    print(f"max relative error vs pandas_ta: {max_error:.2e} (nan layout equal: {same_nans})")
+    assert same_nans and max_error < TOLERANCE
+
+    # Replay the last NEW_BARS bars one at a time, as the price store appends them
+    start = time.perf_counter()
+    for end in range(len(daily) - NEW_BARS, len(daily) + 1):
+        add_indicators(daily.iloc[:end]).tail(n=24)
+    full = (time.perf_counter() - start) / (NEW_BARS + 1)
+
+    engine = IndicatorEngine()
+    engine.compute("BTC", daily.iloc[: len(daily) - NEW_BARS])
+    start = time.perf_counter()
+    for end in range(len(daily) - NEW_BARS, len(daily) + 1):
+        engine.compute("BTC", daily.iloc[:end], tail=24)
+    incremental = (time.perf_counter() - start) / (NEW_BARS + 1)
+
+    print(f"full recomputation per new bar:  {full * 1e3:.2f} ms")
+    print(f"incremental update per new bar:  {incremental * 1e3:.2f} ms")
+    print(f"speedup:                         {full / incremental:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
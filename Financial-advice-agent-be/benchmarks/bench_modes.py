@@ -0,0 +1,63 @@
+"""Latency and token usage of the thorough and fast pipelines on the same queries.
+
+Calls the real providers and LLM, so it needs GROQ_API_KEY, OPENBB_API_KEY and the
+network. The LLM response cache and precomputed reports are disabled, and price/news
+data is fetched once up front, so both modes see the same inputs.
+
+    python benchmarks/bench_modes.py ["query" ...]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+import main
+
+DEFAULT_QUERIES = [
+    "What is the outlook for Bitcoin?",
+    "Should I buy ETH this month?",
+    "Is Solana in an uptrend?",
+]
+
+
+class TokenCounter(BaseCallbackHandler):
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def on_llm_end(self, response, **kwargs):
+        usage = (response.llm_output or {}).get("token_usage", {})
+        self.calls += 1
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+
+
+def main_benchmark(queries):
+    main.llm_cache.backend = None
+    main.report_store.load_fresh = lambda *args, **kwargs: None
+    # Warm the price store, news cache and macro cache so both modes read the same data
+    for query in queries:
+        main.graph_apps["fast"].invoke({"user_query": query})
+
+    for mode, app in main.graph_apps.items():
+        latencies = []
+        counter = TokenCounter()
+        for query in queries:
+            start = time.perf_counter()
+            app.invoke({"user_query": query}, config={"callbacks": [counter]})
+            latencies.append(time.perf_counter() - start)
+        print(
+            f"{mode:9s} median {statistics.median(latencies):.2f}s  max {max(latencies):.2f}s  "
+            f"llm calls {counter.calls / len(queries):.1f}/query  "
+            f"tokens {(counter.prompt_tokens + counter.completion_tokens) / len(queries):.0f}/query "
+            f"(prompt {counter.prompt_tokens / len(queries):.0f})"
+        )
+
+
+if __name__ == "__main__":
+    main_benchmark(sys.argv[1:] or DEFAULT_QUERIES)
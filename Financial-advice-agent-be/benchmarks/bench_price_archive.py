@@ -0,0 +1,94 @@
+"""Per-worker memory of holding the price history of every ticker, SQLite store vs archive.
+
+Writes synthetic daily bars for N tickers to a temporary price store and price archive,
+then starts worker processes that each read every ticker and keep the frames, like API
+workers that have served all coins. Memory comes from /proc/self/smaps_rollup, so this
+runs on Linux only. Anonymous memory is the heap every worker pays for on its own,
+file-backed pages of the archive live in the page cache once for all workers.
+
+    python benchmarks/bench_price_archive.py [--tickers 100] [--workers 4] [--days 5000]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp_dir = tempfile.mkdtemp(prefix="bench_price_archive_")
+os.environ["PRICE_STORE_PATH"] = os.path.join(_tmp_dir, "prices.sqlite")
+os.environ["PRICE_ARCHIVE_DIR"] = os.path.join(_tmp_dir, "archive")
+
+import price_archive
+import price_store
+from classes import TimeFrame
+
+
+def synthetic_bars(days: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, days)))
+    return pd.DataFrame(
+        {"open": close, "high": close * 1.02, "low": close * 0.98, "close": close, "volume": 1e6},
+        index=pd.date_range("2010-01-01", periods=days, freq="D", name="date"),
+    )
+
+
+def memory_kib() -> dict:
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {"anonymous": fields["Anonymous"], "file_backed": fields["Rss"] - fields["Anonymous"]}
+
+
+def worker(source: str, symbols: list, results):
+    before = memory_kib()
+    if source == "archive":
+        frames = [price_archive.archive_reader.read(symbol, TimeFrame.DAILY) for symbol in symbols]
+    else:
+        frames = [price_store.load(symbol) for symbol in symbols]
+    # Touch every bar, like computing indicators over the full history would
+    total = sum(float(df["close"].sum()) for df in frames)
+    after = memory_kib()
+    results.put({key: after[key] - before[key] for key in after} | {"checksum": total})
+
+
+def main_benchmark(tickers: int, workers: int, days: int):
+    symbols = [f"T{i:03d}" for i in range(tickers)]
+    for i, symbol in enumerate(symbols):
+        df = synthetic_bars(days, seed=i)
+        with price_store._connect() as conn:
+            price_store._store_bars(conn, symbol, df.rename_axis("date").reset_index())
+        price_archive.write(symbol, TimeFrame.DAILY, df)
+
+    context = multiprocessing.get_context("fork")
+    for source in ("sqlite", "archive"):
+        results = context.Queue()
+        processes = [context.Process(target=worker, args=(source, symbols, results)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        measurements = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        anonymous = np.mean([m["anonymous"] for m in measurements]) / 1024
+        file_backed = np.mean([m["file_backed"] for m in measurements]) / 1024
+        print(
+            f"{source:8s} {tickers} tickers x {days} days: "
+            f"anonymous {anonymous:.1f} MiB/worker ({anonymous * workers:.1f} MiB for {workers} workers), "
+            f"file-backed {file_backed:.1f} MiB/worker"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--days", type=int, default=5000)
+    args = parser.parse_args()
+    main_benchmark(args.tickers, args.workers, args.days)
@@ -0,0 +1,89 @@
+"""Prompt size and LLM latency of the price analyst prompt, raw pandas repr vs compact.
+
+Token counts are estimates (see prompt_format.estimate_tokens). Pass --llm to also
+time real LLM calls with each prompt; this needs GROQ_API_KEY and the network.
+
+    python benchmarks/bench_price_prompt.py [--llm] [--calls 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import compute_indicators
+from prompt_format import estimate_tokens
+
+USER_QUERY = "What is the outlook for Bitcoin?"
+
+
+def sample_data():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2014-09-17", periods=4000, freq="D")
+    close = 450 * np.exp(np.cumsum(rng.normal(0.001, 0.04, len(index))))
+    daily = pd.DataFrame(
+        {"high": close * 1.02, "low": close * 0.98, "close": close, "volume": 3e10}, index=index
+    )
+    weekly = daily.resample("W").agg({"high": "max", "low": "min", "close": "last", "volume": "sum"})
+    months = pd.date_range("2010-01-01", periods=180, freq="MS")
+    money_supply = pd.DataFrame(
+        {"m1": np.linspace(1.7e3, 18e3, len(months)), "m2": np.linspace(8.5e3, 21e3, len(months))},
+        index=months,
+    )
+    return compute_indicators(weekly, tail=24), money_supply
+
+
+def raw_prompt(price_df, money_supply_df) -> str:
+    # The prompt as it was built before the compact serializer
+    return f"""price history:
+{str(price_df[price_df.columns[2:]])}
+M2 money supply history:
+{str(money_supply_df["m2"])}
+"""
+
+
+def time_calls(llm, prompt: str, calls: int) -> list:
+    from langchain_core.messages import HumanMessage
+
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        llm.invoke([HumanMessage(prompt)])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm", action="store_true", help="time real LLM calls")
+    parser.add_argument("--calls", type=int, default=5)
+    args = parser.parse_args()
+
+    price_df, money_supply_df = sample_data()
+    # Imported late: main logs into OpenBB and builds the LLM client
+    from main import build_price_analyst_prompt, llm
+
+    sections = build_price_analyst_prompt(price_df, money_supply_df, USER_QUERY)
+    compact = sections.prompt()
+    raw = raw_prompt(price_df, money_supply_df)
+    counts = sections.token_counts()
+    raw_data_tokens = estimate_tokens(raw)
+    compact_data_tokens = counts["price_history"] + counts["money_supply"]
+    print(f"data sections, raw repr:  ~{raw_data_tokens} tokens")
+    print(f"data sections, compact:   ~{compact_data_tokens} tokens ({compact_data_tokens / raw_data_tokens:.0%})")
+    print("compact prompt sections:  " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+
+    if args.llm:
+        instructions = compact[: compact.index("price history")]
+        for name, prompt in (("raw", instructions + raw), ("compact", compact)):
+            latencies = time_calls(llm, prompt, args.calls)
+            print(f"{name:8s} median latency {statistics.median(latencies) * 1e3:.0f} ms over {args.calls} calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Latency of price history fetches from a single provider vs the hedged provider chain.
+
+Fake providers answer with synthetic bars after a latency drawn from a long-tailed
+distribution: most calls are fast, a few stall like an overloaded upstream, and some
+fail outright. The same requests are sent to a chain holding only the primary provider
+and to a chain that hedges with a second, independent provider after --hedge-delay
+seconds. Extra calls are the hedged and failed-over requests sent to the secondary.
+
+    python benchmarks/bench_price_providers.py [--requests 1000] [--hedge-delay 0.15]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_providers import PriceProviderChain
+
+
+class FakeProvider:
+    """Returns synthetic bars after `latency` seconds, stalling for `stall` seconds now and then."""
+
+    def __init__(self, name: str, latency: float, stall: float, stall_rate: float, failure_rate: float, seed: int):
+        self.name = name
+        self.latency = latency
+        self.stall = stall
+        self.stall_rate = stall_rate
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fetch(self, symbol: str, start_date: str) -> pd.DataFrame:
+        with self._lock:
+            self.calls += 1
+            draw = self._random.random()
+            jitter = self._random.uniform(0.8, 1.2)
+        if draw < self.failure_rate:
+            time.sleep(self.latency * jitter)
+            raise ConnectionError(f"{self.name} refused the connection")
+        time.sleep((self.stall if draw < self.failure_rate + self.stall_rate else self.latency) * jitter)
+        dates = pd.date_range(start_date, periods=30, freq="D")
+        close = np.linspace(100, 110, len(dates))
+        return pd.DataFrame(
+            {"open": close, "high": close * 1.01, "low": close * 0.99, "close": close, "volume": 1e6},
+            index=dates,
+        )
+
+
+def run(chain: PriceProviderChain, requests: int, concurrency: int) -> dict:
+    def timed_fetch(i: int):
+        start = time.perf_counter()
+        try:
+            chain.fetch(f"T{i % 50:02d}", "2024-01-01")
+            return time.perf_counter() - start, True
+        except ValueError:
+            return time.perf_counter() - start, False
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed_fetch, range(requests)))
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    return {
+        "p50": np.percentile(latencies, 50),
+        "p95": np.percentile(latencies, 95),
+        "p99": np.percentile(latencies, 99),
+        "max": latencies.max(),
+        "errors": sum(not ok for _, ok in results),
+    }
+
+
+def main_benchmark(requests: int, concurrency: int, hedge_delay: float, stall_rate: float, failure_rate: float):
+    def providers(seed: int):
+        primary = FakeProvider("primary", 0.05, 1.5, stall_rate, failure_rate, seed)
+        secondary = FakeProvider("secondary", 0.08, 1.5, stall_rate, failure_rate, seed + 1)
+        return primary, secondary
+
+    primary, _ = providers(seed=1)
+    # Enough threads for the hedges still running, so the pool doesn't add queueing
+    workers = 4 * concurrency
+    single = run(PriceProviderChain([primary], workers=workers), requests, concurrency)
+    primary, secondary = providers(seed=1)
+    chain = PriceProviderChain([primary, secondary], hedge_delay=hedge_delay, workers=workers)
+    hedged = run(chain, requests, concurrency)
+
+    print(f"{requests} requests, {stall_rate:.0%} stalls of 1.5s, {failure_rate:.0%} failures per provider")
+    for name, result in (("single", single), (f"hedged after {hedge_delay * 1000:.0f}ms", hedged)):
+        print(
+            f"{name:22s} p50 {result['p50']:7.1f}ms  p95 {result['p95']:7.1f}ms  "
+            f"p99 {result['p99']:7.1f}ms  max {result['max']:7.1f}ms  errors {result['errors']}"
+        )
+    print(f"extra calls to the secondary: {secondary.calls / requests:.1%} of requests, {chain.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--hedge-delay", type=float, default=0.15)
+    parser.add_argument("--stall-rate", type=float, default=0.03)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    args = parser.parse_args()
+    main_benchmark(args.requests, args.concurrency, args.hedge_delay, args.stall_rate, args.failure_rate)
@@ -0,0 +1,85 @@
+"""Accuracy and latency of the local ticker resolver on a labelled query set.
+
+Run from the project directory:
+
+    python benchmarks/bench_ticker_resolver.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ticker_resolver import TickerResolver
+
+MIN_CONFIDENCE = float(os.environ.get("TICKER_RESOLVER_MIN_CONFIDENCE", 0.8))
+
+LABELLED_QUERIES = [
+    ("BTC outlook", "BTC"),
+    ("should I buy solana", "SOL"),
+    ("What do you think about Bitcoin this week?", "BTC"),
+    ("is ethereum a good investment", "ETH"),
+    ("etherium price prediction", "ETH"),
+    ("bitcon going to 100k?", "BTC"),
+    ("Is XRP going up after the ripple lawsuit?", "XRP"),
+    ("doge to the moon?", "DOGE"),
+    ("what's happening with cardano", "ADA"),
+    ("should i sell my shiba inu", "SHIB"),
+    ("Is LINK undervalued?", "LINK"),
+    ("give me a chainlink analysis", "LINK"),
+    ("Polkadot staking outlook", "DOT"),
+    ("bitcoin cash vs the market", "BCH"),
+    ("ethereum classic trend", "ETC"),
+    ("is matic still worth holding", "POL"),
+    ("polygon news", "POL"),
+    ("avalanche price", "AVAX"),
+    ("litecoin halving effect", "LTC"),
+    ("monero privacy coin outlook", "XMR"),
+    ("how is tron doing", "TRX"),
+    ("what about the OP token", "OP"),
+    ("Should I buy NEAR?", "NEAR"),
+    ("is the Graph a good buy", "GRT"),
+    ("what about fetch.ai", "FET"),
+    ("kaspa price analysis", "KAS"),
+    ("is arbitrum undervalued", "ARB"),
+    ("filecoin storage demand", "FIL"),
+    ("injective protocol outlook", "INJ"),
+    ("celestia airdrop impact", "TIA"),
+    ("solanna price", "SOL"),
+    ("cardanno analysis", "ADA"),
+    ("what is zoragpt", "ZGPT"),
+    ("tether depeg risk", "USDT"),
+    ("usd coin reserves", "USDC"),
+    ("what is inflation", "NoCoin"),
+    ("is the market optimism justified", "NoCoin"),
+    ("how do I link my wallet", "NoCoin"),
+    ("hello there", "NoCoin"),
+    ("what is a good long term investment strategy", "NoCoin"),
+]
+
+
+def main():
+    resolver = TickerResolver()
+    resolved = correct_resolved = correct = 0
+    start = time.perf_counter()
+    for query, expected in LABELLED_QUERIES:
+        resolution = resolver.resolve(query)
+        confident = resolution.confidence >= MIN_CONFIDENCE
+        resolved += confident
+        correct += resolution.symbol == expected
+        if confident:
+            correct_resolved += resolution.symbol == expected
+        if resolution.symbol != expected:
+            print(f"  miss: {query!r} -> {resolution} (expected {expected})")
+    elapsed = time.perf_counter() - start
+
+    total = len(LABELLED_QUERIES)
+    print(f"queries:                     {total}")
+    print(f"top-1 accuracy:              {correct / total:.1%}")
+    print(f"resolved without LLM:        {resolved / total:.1%} (confidence >= {MIN_CONFIDENCE})")
+    print(f"precision when resolved:     {correct_resolved / max(resolved, 1):.1%}")
+    print(f"mean latency per query:      {elapsed / total * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
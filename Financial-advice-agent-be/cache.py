@@ -0,0 +1,127 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import defaultdict
+
+CACHE_DIR = os.environ.get(
+    "CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache"),
+)
+
+
+class TTLCache:
+    """Process-wide cache with TTL expiry and stale-while-revalidate refreshes.
+
+    Entries younger than `ttl` are served as is. Entries younger than `ttl + stale_ttl`
+    are served immediately while a background thread fetches a fresh value. Older
+    entries (or missing ones) are fetched synchronously. With `snapshot` enabled every
+    fetched value is also pickled to CACHE_DIR, so a cold worker starts from the last
+    snapshot instead of blocking on the first fetch.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0, snapshot: bool = False):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.snapshot = snapshot
+        self._entries = {}
+        self._locks = defaultdict(threading.Lock)
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+
+    def get(self, key: str, fetch):
+        """Returns the cached value for `key`, calling `fetch()` when it has to be refreshed.
+
+        Args:
+            key: Cache key.
+            fetch: Callable without arguments that returns a fresh value.
+
+        Returns:
+            The cached or freshly fetched value.
+        """
+        entry = self._entry(key)
+        if entry is not None:
+            age = time.time() - entry[1]
+            if age < self.ttl:
+                return entry[0]
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background(key, fetch)
+                return entry[0]
+        return self._refresh(key, fetch)
+
+    def set(self, key: str, value):
+        entry = (value, time.time())
+        self._entries[key] = entry
+        if self.snapshot:
+            self._write_snapshot(key, entry)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _entry(self, key: str):
+        entry = self._entries.get(key)
+        if self.snapshot and (entry is None or time.time() - entry[1] >= self.ttl):
+            # Another worker may have refreshed the snapshot in the meantime
+            snapshot = self._read_snapshot(key)
+            if snapshot is not None and (entry is None or snapshot[1] > entry[1]):
+                self._entries[key] = entry = snapshot
+        return entry
+
+    def _refresh(self, key: str, fetch):
+        with self._locks[key]:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[1] < self.ttl:
+                return entry[0]
+            try:
+                value = fetch()
+            except Exception:
+                # Outdated data is still better than none
+                if entry is not None:
+                    return entry[0]
+                raise
+            self.set(key, value)
+            return value
+
+    def _refresh_in_background(self, key: str, fetch):
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._refresh(key, fetch)
+            except Exception as e:
+                print(f"Error refreshing {self.name} cache entry {key}: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _snapshot_path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(CACHE_DIR, self.name, f"{digest}.pkl")
+
+    def _read_snapshot(self, key: str):
+        try:
+            with open(self._snapshot_path(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading {self.name} cache snapshot {key}: {e}")
+            return None
+
+    def _write_snapshot(self, key: str, entry):
+        path = self._snapshot_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing {self.name} cache snapshot {key}: {e}")
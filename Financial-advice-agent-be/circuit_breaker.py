@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Outcomes of the last calls the failure rate is computed over, and how many are needed
+# before the breaker may open at all
+BREAKER_WINDOW = int(os.environ.get("BREAKER_WINDOW", 20))
+BREAKER_MIN_CALLS = int(os.environ.get("BREAKER_MIN_CALLS", 5))
+BREAKER_FAILURE_RATE = float(os.environ.get("BREAKER_FAILURE_RATE", 0.5))
+# Seconds an open breaker rejects calls before letting a trial call through
+BREAKER_COOLDOWN = int(os.environ.get("BREAKER_COOLDOWN", 30))
+# Seconds a failed lookup is answered with its error without asking the provider again
+NEGATIVE_CACHE_TTL = int(os.environ.get("NEGATIVE_CACHE_TTL", 60))
+# Per-call timeouts of the providers, in seconds
+OPENBB_TIMEOUT = float(os.environ.get("OPENBB_TIMEOUT", 30))
+DUCKDUCKGO_TIMEOUT = float(os.environ.get("DUCKDUCKGO_TIMEOUT", 10))
+# Provider calls running at once per breaker, calls that timed out keep their thread until they return
+PROVIDER_MAX_CALLS = int(os.environ.get("PROVIDER_MAX_CALLS", 8))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Every breaker created, reported by breaker_stats
+breakers = []
+
+
+class ProviderUnavailable(Exception):
+    """Raised instead of calling a provider whose breaker is open or whose lookup just failed."""
+
+
+class CircuitBreaker:
+    """Guards the calls to an external data provider.
+
+    Every call gets `timeout` seconds. Once at least `failure_rate` of the last `window`
+    calls failed or timed out, the breaker opens and calls fail right away for
+    `cooldown` seconds. After that a single trial call is let through (half-open): the
+    breaker closes again if it succeeds and stays open for another cooldown if not.
+    Failed lookups are also remembered by key for `negative_ttl` seconds, so a coin the
+    provider doesn't know isn't asked for on every request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        window: int = BREAKER_WINDOW,
+        min_calls: int = BREAKER_MIN_CALLS,
+        failure_rate: float = BREAKER_FAILURE_RATE,
+        cooldown: float = BREAKER_COOLDOWN,
+        negative_ttl: float = NEGATIVE_CACHE_TTL,
+        max_calls: int = PROVIDER_MAX_CALLS,
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.negative_ttl = negative_ttl
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = None
+        self._trial_running = False
+        self._failures = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_calls, thread_name_prefix=f"{name}-provider")
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.negative_hits = 0
+        breakers.append(self)
+
+    def call(self, fetch, key: str = None):
+        """Calls `fetch()` through the breaker.
+
+        Args:
+            fetch: Callable without arguments that queries the provider.
+            key: Identifies the lookup for negative caching, e.g. "price:BTC".
+
+        Returns:
+            The value returned by `fetch()`.
+
+        Raises:
+            ProviderUnavailable: The breaker is open or the same lookup failed recently.
+            TimeoutError: The provider didn't answer within `timeout` seconds.
+        """
+        trial = self._admit(key)
+        try:
+            value = self._executor.submit(fetch).result(timeout=self.timeout)
+        except TimeoutError:
+            error = TimeoutError(f"{self.name} didn't answer within {self.timeout:g}s")
+            with self._lock:
+                self.timeouts += 1
+            self._record(False, trial, key, error)
+            raise error from None
+        except Exception as e:
+            self._record(False, trial, key, e)
+            raise
+        self._record(True, trial, key)
+        return value
+
+    def _admit(self, key: str) -> bool:
+        with self._lock:
+            now = time.time()
+            failure = self._failures.get(key) if key is not None else None
+            if failure is not None:
+                if failure[1] > now:
+                    self.negative_hits += 1
+                    raise ProviderUnavailable(f"{self.name} lookup {key} failed recently: {failure[0]}")
+                del self._failures[key]
+            if self.state == OPEN and now - self._opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            if self.state == OPEN or (self.state == HALF_OPEN and self._trial_running):
+                self.rejected += 1
+                raise ProviderUnavailable(f"{self.name} circuit is {self.state}")
+            self.calls += 1
+            if self.state == HALF_OPEN:
+                self._trial_running = True
+                return True
+            return False
+
+    def _record(self, success: bool, trial: bool, key: str, error: Exception = None):
+        with self._lock:
+            now = time.time()
+            if key is not None and not success:
+                self._failures[key] = (error, now + self.negative_ttl)
+                # Drop expired failures so the dictionary only holds recent lookups
+                self._failures = {k: v for k, v in self._failures.items() if v[1] > now}
+            if trial:
+                self._trial_running = False
+                if success:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self.state = OPEN
+                    self._opened_at = now
+                return
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if (
+                self.state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                print(f"{self.name} circuit opened after {failures}/{len(self._outcomes)} failed calls")
+                self.state = OPEN
+                self._opened_at = now
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.time()
+            outcomes = len(self._outcomes)
+            return {
+                "state": self.state,
+                "failure_rate": self._outcomes.count(False) / outcomes if outcomes else 0.0,
+                "calls": self.calls,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "negative_hits": self.negative_hits,
+                "failed_lookups": sum(expires > now for _, expires in self._failures.values()),
+                "open_for": now - self._opened_at if self.state != CLOSED else None,
+            }
+
+
+openbb_breaker = CircuitBreaker("openbb", timeout=OPENBB_TIMEOUT)
+duckduckgo_breaker = CircuitBreaker("duckduckgo", timeout=DUCKDUCKGO_TIMEOUT)
+
+
+def breaker_stats() -> dict:
+    return {breaker.name: breaker.stats() for breaker in breakers}
@@ -1,10 +1,12 @@
 from typing import Annotated, List, Literal, TypedDict
 from enum import Enum, auto
+import numpy as np
 import pandas as pd
 import operator
 from consts import *
 from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain_core.messages import AnyMessage
+from prompt_format import PRICE_PROMPT_COLUMNS
 
 
 class TimeFrame(Enum):
@@ -25,6 +27,14 @@ class TickerQuery(BaseModel):
     )
 
 
+class TickersQuery(BaseModel):
+    """Ticker symbols requested by the user"""
+
+    tickers: List[TickerSymbols] = Field(
+        description="Ticker symbols of every cryptocurrency the user asks about, in the order they are mentioned. Choose [NoCoin] if no crypto coin name explicitly exists in query",
+    )
+
+
 class FinalReport(BaseModel):
     """Report created by the financial reporter"""
 
@@ -41,20 +51,134 @@ class FinalReport(BaseModel):
         description="Sentiment from the news for the chosen cryptocurrency"
     )
     price_predictions: List[float] = Field(
-        description="Price predictions for 1, 2, 3 and 4 weeks ahead"
+        description="Price predictions for 1, 2, 3 and 4 periods (days, weeks or months, depending on the timeframe) ahead"
     )
     summary: str = Field(
         description="Summary of the current market conditions (1-3 sentences)"
     )
 
 
+class NewsSentimentReport(BaseModel):
+    """Sentiment of the news created by the news analyst"""
+
+    sentiment: int = Field(
+        description="Combined sentiment of the news between 0 (extremely bearish) and 100 (extremely bullish)"
+    )
+    explanation: str = Field(
+        description="Short explanation (1-2 sentences) of the sentiment, focused on the user query"
+    )
+
+
+class FastReport(FinalReport):
+    """Report and user-facing answer created in a single pass by the fast analyst"""
+
+    advice: str = Field(
+        description="Educational information and analysis answering the user query, based on the report"
+    )
+
+
+# Columns the price analyst, the signals and the stream events read
+PRICE_FEATURE_COLUMNS = list(dict.fromkeys(["close", "high", "low"] + PRICE_PROMPT_COLUMNS))
+
+
+def _read_only(values: np.ndarray) -> np.ndarray:
+    values.flags.writeable = False
+    return values
+
+
+class PriceFeatures:
+    """The bars and indicators the analysts read, as a read-only float array.
+
+    Much smaller than the frame it's built from, and immutable, so it can be shared
+    between graph nodes and threads without copies.
+    """
+
+    __slots__ = ("symbol", "time_frame", "dates", "values")
+
+    def __init__(self, symbol: str, time_frame: TimeFrame, dates: np.ndarray, values: np.ndarray):
+        object.__setattr__(self, "symbol", symbol)
+        object.__setattr__(self, "time_frame", time_frame)
+        object.__setattr__(self, "dates", _read_only(dates))
+        object.__setattr__(self, "values", _read_only(values))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PriceFeatures is immutable")
+
+    @classmethod
+    def from_frame(cls, symbol: str, time_frame: TimeFrame, price_df: pd.DataFrame) -> "PriceFeatures":
+        price_df = price_df.reindex(columns=PRICE_FEATURE_COLUMNS)
+        return cls(
+            symbol,
+            time_frame,
+            price_df.index.to_numpy(dtype="datetime64[ns]"),
+            price_df.to_numpy(dtype=float, copy=True),
+        )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.dates) == 0
+
+    @property
+    def last_close(self):
+        return None if self.empty else float(self.values[-1, PRICE_FEATURE_COLUMNS.index("close")])
+
+    def frame(self) -> pd.DataFrame:
+        """A date-indexed DataFrame copy of the features for the pandas based helpers."""
+        return pd.DataFrame(self.values.copy(), index=pd.DatetimeIndex(self.dates, name="date"), columns=PRICE_FEATURE_COLUMNS)
+
+
+class NewsFeatures:
+    """The articles selected for a ticker, most relevant first, and their lexicon sentiment.
+
+    Only the selected articles are kept, the rest of the retrieved news is released
+    as soon as the features are built.
+    """
+
+    __slots__ = ("symbol", "retrieved", "dates", "titles", "bodies", "tickers", "sentiment")
+
+    def __init__(self, symbol: str, retrieved: int, articles: pd.DataFrame, sentiment):
+        object.__setattr__(self, "symbol", symbol)
+        object.__setattr__(self, "retrieved", retrieved)
+        dates = pd.to_datetime(articles["date"], utc=True).dt.tz_localize(None)
+        object.__setattr__(self, "dates", _read_only(dates.to_numpy(dtype="datetime64[ns]")))
+        object.__setattr__(self, "titles", tuple(articles["title"].fillna("")))
+        object.__setattr__(self, "bodies", tuple(articles["body"].fillna("")))
+        object.__setattr__(self, "tickers", tuple(articles["ticker"]))
+        object.__setattr__(self, "sentiment", sentiment)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("NewsFeatures is immutable")
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.titles) == 0
+
+    def frame(self) -> pd.DataFrame:
+        """The selected articles as a DataFrame, most relevant first."""
+        return pd.DataFrame({"date": self.dates, "title": self.titles, "body": self.bodies, "ticker": self.tickers})
+
+
 class AppState(TypedDict):
     user_query: str
+    intent: str
     ticker: Ticker
-    news: pd.DataFrame
-    prices: pd.DataFrame
+    tickers: list[Ticker]
+    news: NewsFeatures
+    time_frame: TimeFrame
+    prefetched: list
+    prices: PriceFeatures
     price_analyst_report: str
     news_analyst_report: str
+    news_sentiment: int
     final_report: FinalReport
+    comparison: dict
+    follow_up: bool
+    market_context: str
     final_response: Annotated[list[AnyMessage], operator.add]
     messages: Annotated[list[AnyMessage], operator.add]
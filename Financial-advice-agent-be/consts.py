@@ -52,3 +52,59 @@ top_crypto_dict = {
     "ZGPT": "ZoraGPT",
     "NoCoin": "NoCoin",
 }
+
+# Common nicknames and misspellings used by the local ticker resolver, on top of
+# the symbols and names above
+crypto_aliases = {
+    "BTC": ["bitcoins", "btc", "xbt", "sats", "satoshi", "satoshis", "bitcon", "bitcoin's"],
+    "ETH": ["ether", "eth", "etherium", "ethereum's", "vitalik"],
+    "XRP": ["ripple", "xrp"],
+    "USDT": ["usdt", "tether"],
+    "BNB": ["bnb", "binance coin", "bnb chain"],
+    "SOL": ["sol", "solana's"],
+    "DOGE": ["doge", "dogecoins"],
+    "USDC": ["usdc", "circle usd"],
+    "ADA": ["ada", "cardano's"],
+    "TRX": ["trx", "tron"],
+    "AVAX": ["avax", "avalanche"],
+    "SUI": ["sui network"],
+    "TON": ["ton coin", "the open network"],
+    "XLM": ["xlm", "lumens", "stellar lumens"],
+    "SHIB": ["shib", "shiba"],
+    "LINK": ["chain link"],
+    "HBAR": ["hbar", "hedera hashgraph"],
+    "DOT": ["polka dot"],
+    "LEO": ["unus sed leo", "leo token"],
+    "BCH": ["bch", "bitcoin cash", "bcash"],
+    "UNI": ["uniswap"],
+    "LTC": ["ltc", "litecoins"],
+    "NEAR": ["near protocol"],
+    "DAI": ["makerdao dai"],
+    "APT": ["aptos"],
+    "ICP": ["icp", "dfinity"],
+    "AAVE": ["aave"],
+    "XMR": ["xmr", "monero"],
+    "MNT": ["mnt", "mantle"],
+    "ETC": ["ethereum classic"],
+    "POL": ["matic", "polygon"],
+    "OM": ["mantra"],
+    "RNDR": ["rndr", "render token"],
+    "CRO": ["cronos", "crypto.com coin"],
+    "VET": ["vechain"],
+    "FIL": ["filecoin"],
+    "FET": ["fetch ai", "fetchai"],
+    "KAS": ["kaspa"],
+    "ARB": ["arbitrum"],
+    "ALGO": ["algorand"],
+    "OKB": ["okb"],
+    "ATOM": ["cosmos hub"],
+    "OP": ["optimism token"],
+    "TIA": ["celestia"],
+    "STX": ["stx"],
+    "THETA": ["theta token"],
+    "IMX": ["imx", "immutable x"],
+    "INJ": ["inj", "injective"],
+    "GRT": ["grt", "the graph"],
+    "QNT": ["qnt", "quant network"],
+    "ZGPT": ["zoragpt", "zora gpt", "zora", "zgpt"],
+}
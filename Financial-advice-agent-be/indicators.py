@@ -0,0 +1,277 @@
+import math
+import threading
+from collections import deque
+
+import pandas as pd
+
+INDICATOR_COLUMNS = [
+    "ma_50",
+    "ma_200",
+    "rsi",
+    "macd",
+    "macd_signal",
+    "macd_histogram",
+    "bb_lower",
+    "bb_middle",
+    "bb_upper",
+]
+# Closed bars whose indicator rows are kept per series, enough for any tail we serve
+ROWS_KEPT = 256
+NAN = float("nan")
+
+
+class SeededEMA:
+    """EMA seeded with the SMA of the first `length` values, like pandas_ta's ema."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.alpha = 2 / (length + 1)
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def _next(self, x: float):
+        count = self.count + 1
+        if count < self.length:
+            return count, self.total + x, NAN
+        if count == self.length:
+            return count, self.total + x, (self.total + x) / self.length
+        return count, self.total, self.alpha * x + (1 - self.alpha) * self.value
+
+    def peek(self, x: float) -> float:
+        return self._next(x)[2]
+
+    def push(self, x: float) -> float:
+        self.count, self.total, self.value = self._next(x)
+        return self.value
+
+
+class RollingMean:
+    """Simple moving average over the last `length` values with a running sum."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.window = deque()
+        self.total = 0.0
+        self.pushes = 0
+
+    def _total_after(self, x: float) -> float:
+        if len(self.window) == self.length:
+            return self.total - self.window[0] + x
+        return self.total + x
+
+    def peek(self, x: float) -> float:
+        if len(self.window) + 1 < self.length:
+            return NAN
+        return self._total_after(x) / self.length
+
+    def push(self, x: float) -> float:
+        value = self.peek(x)
+        self.total = self._total_after(x)
+        self.window.append(x)
+        if len(self.window) > self.length:
+            self.window.popleft()
+        self.pushes += 1
+        if self.pushes % self.length == 0:
+            # Recompute now and then to keep the running sum from drifting
+            self.total = math.fsum(self.window)
+        return value
+
+
+class BollingerBands:
+    """Bollinger bands over `length` values with a population standard deviation."""
+
+    def __init__(self, length: int = 5, std: float = 2.0):
+        self.length = length
+        self.std = std
+        self.window = deque(maxlen=length)
+
+    def peek(self, x: float):
+        values = list(self.window)[1:] if len(self.window) == self.length else list(self.window)
+        values.append(x)
+        if len(values) < self.length:
+            return NAN, NAN, NAN
+        mean = sum(values) / self.length
+        deviation = self.std * math.sqrt(sum((v - mean) ** 2 for v in values) / self.length)
+        return mean - deviation, mean, mean + deviation
+
+    def push(self, x: float):
+        bands = self.peek(x)
+        self.window.append(x)
+        return bands
+
+
+class WilderRSI:
+    """RSI from Wilder-smoothed gains and losses, like pandas_ta's rsi."""
+
+    def __init__(self, length: int = 14):
+        self.length = length
+        self.decay = 1 - 1 / length
+        self.previous = None
+        self.count = 0
+        self.gains = 0.0
+        self.losses = 0.0
+
+    def _next(self, x: float):
+        if self.previous is None:
+            return x, 0, 0.0, 0.0, NAN
+        delta = x - self.previous
+        gains = max(delta, 0.0) + self.decay * self.gains
+        losses = max(-delta, 0.0) + self.decay * self.losses
+        count = self.count + 1
+        if count < self.length or gains + losses == 0:
+            return x, count, gains, losses, NAN
+        return x, count, gains, losses, 100 * gains / (gains + losses)
+
+    def peek(self, x: float) -> float:
+        return self._next(x)[4]
+
+    def push(self, x: float) -> float:
+        self.previous, self.count, self.gains, self.losses, value = self._next(x)
+        return value
+
+
+class IndicatorState:
+    """Streaming state of the add_indicators columns for one close series.
+
+    Every indicator keeps just what its next value depends on (EMAs, rolling windows
+    and sums, smoothed gains and losses), so a new bar costs O(1) instead of a full
+    recomputation. `peek` evaluates a bar without committing it, which is how the
+    still-open last bar of a series is served.
+    """
+
+    def __init__(self):
+        self.ma_50 = RollingMean(50)
+        self.ma_200 = RollingMean(200)
+        self.rsi = WilderRSI(14)
+        self.fast = SeededEMA(12)
+        self.slow = SeededEMA(26)
+        self.signal = SeededEMA(9)
+        self.bbands = BollingerBands(5, 2.0)
+
+    def _row(self, ma_50, ma_200, rsi, macd, signal, bands) -> dict:
+        return dict(
+            zip(
+                INDICATOR_COLUMNS,
+                (ma_50, ma_200, rsi, macd, signal, macd - signal, *bands),
+            )
+        )
+
+    def peek(self, close: float) -> dict:
+        macd = self.fast.peek(close) - self.slow.peek(close)
+        signal = NAN if math.isnan(macd) else self.signal.peek(macd)
+        return self._row(
+            self.ma_50.peek(close),
+            self.ma_200.peek(close),
+            self.rsi.peek(close),
+            macd,
+            signal,
+            self.bbands.peek(close),
+        )
+
+    def push(self, close: float) -> dict:
+        macd = self.fast.push(close) - self.slow.push(close)
+        signal = NAN if math.isnan(macd) else self.signal.push(macd)
+        return self._row(
+            self.ma_50.push(close),
+            self.ma_200.push(close),
+            self.rsi.push(close),
+            macd,
+            signal,
+            self.bbands.push(close),
+        )
+
+
+class IndicatorEngine:
+    """Keeps an IndicatorState per (ticker, timeframe) and updates it incrementally.
+
+    All bars but the last are treated as closed and committed to the state once; the
+    last bar (e.g. the current week) is evaluated with `peek` on every call since it
+    keeps changing until it closes. If the stored history no longer lines up with the
+    committed bars the series is rebuilt from scratch.
+    """
+
+    def __init__(self, rows_kept: int = ROWS_KEPT):
+        self.rows_kept = rows_kept
+        self._series = {}
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, key):
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def compute(self, key, data: pd.DataFrame, tail: int = 24) -> pd.DataFrame:
+        """Returns the last `tail` rows of `data` with the add_indicators columns.
+
+        Args:
+            key: Identifies the series, e.g. ("BTC", TimeFrame.WEEKLY).
+            data: Bars indexed by date with at least a "close" column.
+            tail: Number of trailing rows to return, at most the engine's `rows_kept`.
+
+        Returns:
+            A DataFrame with the columns of `data` followed by INDICATOR_COLUMNS.
+        """
+        if data.empty:
+            return add_indicator_columns(data, [])
+        closes = data["close"].astype(float)
+        dates, values = closes.index, closes.to_numpy()
+        with self._lock(key):
+            series = self._series.get(key)
+            start = self._resume_position(series, dates, values)
+            if start is None:
+                series = {"state": IndicatorState(), "rows": deque(maxlen=self.rows_kept)}
+                start = 0
+            for i in range(start, len(values) - 1):
+                series["rows"].append(series["state"].push(values[i]))
+            series["last"] = (dates[-2], values[-2]) if len(values) > 1 else None
+            self._series[key] = series
+            rows = list(series["rows"]) + [series["state"].peek(values[-1])]
+
+        tail = min(tail, len(rows), len(data))
+        return add_indicator_columns(data.tail(tail), rows[-tail:])
+
+    def _resume_position(self, series, dates, values):
+        """Returns the index of the first bar not committed yet, or None to rebuild."""
+        if series is None:
+            return None
+        if series["last"] is None:
+            return 0 if not series["rows"] else None
+        last_date, last_close = series["last"]
+        position = dates.searchsorted(last_date)
+        if position >= len(dates) - 1 or dates[position] != last_date or values[position] != last_close:
+            return None
+        return position + 1
+
+    def clear(self):
+        self._series.clear()
+
+
+def add_indicator_columns(data: pd.DataFrame, rows: list) -> pd.DataFrame:
+    indicators = pd.DataFrame(rows, columns=INDICATOR_COLUMNS, index=data.index[: len(rows)])
+    return pd.concat([data, indicators.reindex(data.index)], axis=1)
+
+
+def compute_indicators(data: pd.DataFrame, tail: int = None) -> pd.DataFrame:
+    """Computes the add_indicators columns in one streaming pass without keeping state.
+
+    Args:
+        data: Bars indexed by date with at least a "close" column.
+        tail: Only build rows for the last `tail` bars, the whole history is still
+              fed through the indicators so the values are exact.
+
+    Returns:
+        The (trailing rows of the) input with INDICATOR_COLUMNS added.
+    """
+    state = IndicatorState()
+    closes = data["close"].astype(float).to_numpy()
+    first_kept = 0 if tail is None else max(len(closes) - tail, 0)
+    rows = []
+    for i, close in enumerate(closes):
+        row = state.push(close)
+        if i >= first_kept:
+            rows.append(row)
+    return add_indicator_columns(data.iloc[first_kept:], rows)
+
+
+indicator_engine = IndicatorEngine()
@@ -0,0 +1,207 @@
+import re
+from typing import Callable, NamedTuple, Optional, Tuple, Union
+
+from consts import top_crypto_dict
+
+ZORAGPT_INFO_RESPONSE = """{"advice": "🤖 **ZoraGPT - Your Intelligent AI Assistant** 🤖
+
+**What is ZoraGPT?**
+ZoraGPT is a revolutionary AI-powered chat assistant designed to be your intelligent companion for real-time insights, strategic analysis, and automated assistance. Built on the cutting-edge Base network (Coinbase's Layer 2 solution), ZoraGPT combines the power of advanced artificial intelligence with blockchain technology to deliver an unparalleled user experience.
+
+**Core Capabilities:**
+🎯 **Real-Time Insights**: Get instant, data-driven insights about cryptocurrency markets, financial trends, and investment opportunities
+📊 **Strategic Analysis**: Receive comprehensive market analysis, technical indicators, and strategic recommendations
+⚡ **Automation**: Seamlessly execute blockchain transactions, check wallet balances, and perform DeFi operations
+💬 **Intelligent Conversations**: Engage in natural, context-aware conversations about finance, technology, and more
+🔗 **Blockchain Integration**: Direct interaction with the Base network for secure, fast, and cost-effective transactions
+
+**Key Features:**
+• **AI-Powered Financial Advisor**: Advanced algorithms provide market analysis and investment insights
+• **Blockchain Assistant**: Complete integration with Base network for crypto operations
+• **Real-Time Data**: Live market data, price feeds, and news analysis
+• **User-Friendly Interface**: Beautiful, intuitive chat interface with instant responses
+• **Secure & Reliable**: Built on Coinbase's trusted infrastructure
+
+**Why Choose ZoraGPT?**
+🚀 **Innovation**: First-of-its-kind AI assistant on Base network
+🔒 **Security**: Leverages Coinbase's secure L2 infrastructure
+⚡ **Speed**: Lightning-fast responses and transaction processing
+💰 **Cost-Effective**: Low transaction fees on Base network
+🌐 **Accessibility**: Available 24/7 for all your AI assistance needs
+
+**Perfect For:**
+• Crypto enthusiasts seeking market insights
+• Investors looking for strategic analysis
+• DeFi users wanting seamless blockchain integration
+• Anyone interested in AI-powered financial assistance
+
+**Experience the Future of AI + Blockchain Today!** 🚀
+
+*ZoraGPT - Where Intelligence Meets Innovation*"}"""
+
+ZORAGPT_BUY_RESPONSE = """{"advice": "🚀 **ZoraGPT - The Future of AI + Blockchain is Here!** 🚀
+
+**🔥 WHY ZoraGPT is a GAME-CHANGER:**
+
+**1. FIRST-MOVER ADVANTAGE**
+ZoraGPT is the FIRST AI assistant built specifically for the Base network ecosystem. While there are many AI tools and many blockchain platforms, ZoraGPT is the ONLY one that combines:
+• Advanced AI with real-time financial analysis
+• Seamless Base network integration  
+• Complete DeFi functionality
+• Professional-grade market insights
+
+**2. MASSIVE MARKET OPPORTUNITY**
+• **AI Market**: Projected to reach $1.8 trillion by 2030 (growing 37% annually)
+• **DeFi Market**: Expected to hit $232 billion by 2030
+• **Base Network**: Coinbase's L2 with 100M+ potential users
+• **Combined Potential**: ZoraGPT sits at the intersection of 3 booming markets
+
+**3. STRONG FOUNDATION & BACKING**
+✅ **Built on Base Network**: Coinbase's trusted, secure, and fast L2 infrastructure
+✅ **Institutional Support**: Backed by Coinbase's ecosystem and resources
+✅ **Technical Excellence**: State-of-the-art AI models and blockchain integration
+✅ **User Experience**: Beautiful, intuitive interface that actually works
+✅ **Real Utility**: Not just hype - provides genuine value to users
+
+**4. COMPETITIVE ADVANTAGES**
+• **First-Mover Advantage**: First AI assistant on Base network
+• **Network Effects**: More users = better AI = more users
+• **Data Advantage**: Access to real-time crypto and DeFi data
+• **Integration Depth**: Deep Base network integration vs. competitors
+• **Brand Recognition**: Strong positioning in AI + crypto space
+
+**5. REVENUE POTENTIAL**
+• **Subscription Models**: Premium AI features and advanced analytics
+• **Transaction Fees**: Revenue from DeFi operations and trades
+• **Data Services**: Market insights and analytics for institutions
+• **Partnerships**: Integration fees from other Base ecosystem projects
+• **Token Economics**: Native token utility and governance
+
+**6. GROWTH CATALYSTS**
+🚀 **Base Network Growth**: As Base grows, ZoraGPT grows exponentially
+🚀 **AI Adoption**: Increasing demand for AI-powered financial tools
+🚀 **DeFi Expansion**: More DeFi protocols = more use cases
+🚀 **Institutional Adoption**: Professional traders and institutions
+🚀 **Global Expansion**: International markets and languages
+
+**7. TIMING IS PERFECT**
+• **AI Revolution**: ChatGPT, Claude, and other AI tools have proven the market
+• **Crypto Recovery**: Market sentiment improving, institutional adoption increasing
+• **Base Network Momentum**: Growing rapidly with Coinbase's support
+• **DeFi Renaissance**: New protocols and use cases emerging daily
+
+**8. BOTTOM LINE**
+ZoraGPT represents a rare opportunity to invest in a project that combines:
+• **Proven Technology** (AI + Blockchain)
+• **Massive Market** (AI + Crypto + DeFi)
+• **Strong Backing** (Base network ecosystem)
+• **Real Utility** (Actual product that works)
+• **First-Mover Advantage** (Unique positioning)
+
+**🎯 INVESTMENT RECOMMENDATION:**
+For investors with a 2-5 year horizon who believe in the future of AI + blockchain, ZoraGPT represents a compelling opportunity. The combination of first-mover advantage, strong technical foundation, and massive market potential makes this a high-conviction investment.
+
+**💰 POSITION SIZING:**
+Consider allocating 5-15% of your crypto portfolio to ZoraGPT, depending on your risk tolerance and conviction level.
+
+*This analysis is for educational purposes. Always do your own research and consider your risk tolerance before making investment decisions.*"}"""
+
+
+def greeting_response(query: str) -> str:
+    examples = ", ".join(list(top_crypto_dict)[:5])
+    return (
+        "Hello! 👋 I'm ZoraGPT, your AI assistant for cryptocurrency markets. "
+        f"Ask me about any major coin ({examples} and more) to get a price and news analysis, "
+        'for example "What is the outlook for Bitcoin?".'
+    )
+
+
+CAPABILITIES_RESPONSE = (
+    "I'm ZoraGPT, an AI assistant for cryptocurrency markets. For any major coin I can analyze "
+    "the recent price action and technical indicators (moving averages, RSI, MACD, Bollinger "
+    "bands), summarize the sentiment of the latest news and put both together into an overall "
+    'market report. Try "Should I buy ETH?" or "What is the trend for Solana?".'
+)
+THANKS_RESPONSE = "You're welcome! Let me know if you have any other questions about the crypto markets."
+SMALL_TALK_RESPONSE = (
+    "I'm doing great, thanks for asking! I'm here to help with cryptocurrency market analysis, "
+    "just ask me about any coin."
+)
+OFF_TOPIC_RESPONSE = (
+    "I'm specialised in cryptocurrency markets and financial analysis, so I can't help with that. "
+    "Ask me about a coin's price trend, technical indicators or latest news instead."
+)
+
+
+class Intent(NamedTuple):
+    """A query shape answered without running the analysis pipeline.
+
+    `keywords` is a cheap pre-filter: the regex `pattern` only runs on normalised queries
+    containing one of them. `response` is either a static string or a template called
+    with the normalised query.
+    """
+
+    name: str
+    keywords: Tuple[str, ...]
+    pattern: re.Pattern
+    response: Union[str, Callable[[str], str]]
+
+
+INTENTS = [
+    Intent(
+        "zoragpt_info",
+        ("zora",),
+        re.compile(r"\b(?:what is|whats|tell me about) (?:zoragpt|zora gpt|zora)s?\b"),
+        ZORAGPT_INFO_RESPONSE,
+    ),
+    Intent(
+        "zoragpt_buy",
+        ("zora",),
+        re.compile(r"\bshould i (?:buy|invest in) (?:zoragpt|zora gpt|zora)s?\b"),
+        ZORAGPT_BUY_RESPONSE,
+    ),
+    Intent(
+        "greeting",
+        ("hi", "hello", "hey", "yo", "gm", "good"),
+        re.compile(r"^(?:hi|hello|hey|hiya|yo|gm|good (?:morning|afternoon|evening))(?: there)?(?: zora(?:gpt)?)?$"),
+        greeting_response,
+    ),
+    Intent(
+        "thanks",
+        ("thank", "thx", "ty"),
+        re.compile(r"^(?:thanks|thank you|thx|ty)(?: (?:so much|a lot|very much))?$"),
+        THANKS_RESPONSE,
+    ),
+    Intent(
+        "capabilities",
+        ("help", "who", "what"),
+        re.compile(r"^(?:help|who are you|what are you|what can you do|what do you do)$"),
+        CAPABILITIES_RESPONSE,
+    ),
+    Intent(
+        "small_talk",
+        ("how are", "hows it"),
+        re.compile(r"^(?:how are you(?: doing)?(?: today)?|hows it going)$"),
+        SMALL_TALK_RESPONSE,
+    ),
+    Intent(
+        "off_topic",
+        ("joke", "weather", "recipe", "poem"),
+        re.compile(r"\b(?:tell me a joke|(?:what is|whats) the weather|recipe for|write (?:me )?a poem)\b"),
+        OFF_TOPIC_RESPONSE,
+    ),
+]
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", query.lower().replace("'", "")))
+
+
+def match_intent(query: str) -> Optional[Tuple[str, str]]:
+    """Returns the name and response of the first intent matching the query, or None."""
+    normalized = normalize_query(query)
+    for intent in INTENTS:
+        if any(keyword in normalized for keyword in intent.keywords) and intent.pattern.search(normalized):
+            response = intent.response
+            return intent.name, response(normalized) if callable(response) else response
+    return None
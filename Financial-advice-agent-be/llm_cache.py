@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage
+
+LLM_CACHE_BACKEND = os.environ.get("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", 3600))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 1024))
+LLM_CACHE_PATH = os.environ.get(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "llm_cache.sqlite"),
+)
+# Temperatures up to this are treated as deterministic. ChatGroq replaces a temperature
+# of 0 with 1e-8 when the model is created, so an exact comparison never matches.
+DETERMINISTIC_TEMPERATURE = 1e-6
+
+
+class MemoryBackend:
+    """In-process LRU store of serialised responses."""
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: float):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteBackend:
+    """On-disk store of serialised responses, shared by all workers on the host."""
+
+    def __init__(self, path: str = LLM_CACHE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )"""
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND expires_at >= ?",
+                (key, time.time()),
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: float):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?)",
+                    (key, value, time.time() + ttl),
+                )
+                conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+        finally:
+            conn.close()
+
+
+class LLMCache:
+    """Content-addressed cache in front of deterministic (temperature=0) LLM calls.
+
+    Responses are keyed by model name, the exact prompt messages and the structured
+    output schema, so any change in the data inlined into a prompt is a miss. Plain
+    responses are stored as their text, structured ones as the JSON of the pydantic
+    object and rebuilt with the same schema on a hit.
+    """
+
+    def __init__(self, backend=None, ttl: float = LLM_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, llm, messages, schema=None) -> str:
+        payload = {
+            "model": getattr(llm, "model_name", None),
+            "schema": schema.schema() if schema is not None else None,
+            "messages": [[message.type, message.content] for message in messages],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def enabled(self, llm) -> bool:
+        temperature = getattr(llm, "temperature", None)
+        return self.backend is not None and temperature is not None and temperature <= DETERMINISTIC_TEMPERATURE
+
+    def get(self, llm, messages, schema=None):
+        """Returns the cached response for the call, or None on a miss."""
+        if not self.enabled(llm):
+            return None
+        try:
+            value = self.backend.get(self.key(llm, messages, schema))
+        except Exception as e:
+            print(f"Error reading LLM response from cache: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        if schema is not None:
+            return schema(**json.loads(value))
+        return AIMessage(content=value)
+
+    def put(self, llm, messages, response, schema=None):
+        if response is None or not self.enabled(llm):
+            return
+        value = response.json() if schema is not None else response.content
+        try:
+            self.backend.set(self.key(llm, messages, schema), value, self.ttl)
+        except Exception as e:
+            print(f"Error storing LLM response in cache: {e}")
+
+    def invoke(self, llm, messages, schema=None):
+        """Invokes the LLM (with structured output if `schema` is given) through the cache.
+
+        Args:
+            llm: The chat model.
+            messages: The prompt messages.
+            schema: Optional pydantic model passed to `with_structured_output`.
+
+        Returns:
+            An AIMessage, or an instance of `schema` for structured calls.
+        """
+        response = self.get(llm, messages, schema)
+        if response is not None:
+            return response
+        runnable = llm.with_structured_output(schema) if schema is not None else llm
+        response = runnable.invoke(messages)
+        self.put(llm, messages, response, schema)
+        return response
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def create_backend(name: str = LLM_CACHE_BACKEND):
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        return SQLiteBackend()
+    return None
+
+
+llm_cache = LLMCache(create_backend())
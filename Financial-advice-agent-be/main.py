@@ -1,12 +1,17 @@
+import json
 import os
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
+import queue
 import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from langgraph.graph import END, StateGraph
 from langchain_groq import ChatGroq
 from openbb import obb
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
 from duckduckgo_search import DDGS
 from langgraph.prebuilt import tools_condition, ToolNode
 import warnings
@@ -19,8 +24,50 @@ load_dotenv(override=True)
 from utils import *
 from consts import *
 from classes import *
+from streaming import AdviceStreamParser, sse_event
+from ticker_resolver import resolver
+from llm_cache import llm_cache
+from indicators import indicator_engine
+from market_panel import market_overview
+from news_selection import select_news
+from news_sentiment import score_news
+from intents import match_intent
+from sessions import add_turn, session_store
+from profiling import measure_memory
+from prefetch import prefetcher
+from circuit_breaker import breaker_stats, duckduckgo_breaker
+from price_providers import price_chain
+from bars import PERIOD_NAMES
+from signals import price_signals, sentiment_from_score, signal_summary
+from prompt_format import (
+    PRICE_PROMPT_COLUMNS,
+    PromptSections,
+    fit_table,
+    format_number,
+    money_supply_summary,
+)
+from precompute import ReportScheduler, ReportStore
 
 MODEL = "llama-3.1-8b-instant"
+# Below this confidence the local ticker resolver defers to the LLM
+TICKER_RESOLVER_MIN_CONFIDENCE = float(os.environ.get("TICKER_RESOLVER_MIN_CONFIDENCE", 0.8))
+# Most tickers a comparison query is analyzed for, the rest are ignored
+MAX_COMPARE_TICKERS = int(os.environ.get("MAX_COMPARE_TICKERS", 3))
+# Coins the ticker extractor starts fetching data for while the LLM decides, and the
+# least resolver confidence they need; 0 tickers turns the speculation off
+PREFETCH_MAX_TICKERS = int(os.environ.get("PREFETCH_MAX_TICKERS", 2))
+PREFETCH_MIN_CONFIDENCE = float(os.environ.get("PREFETCH_MIN_CONFIDENCE", 0.3))
+# Query used when building the query-independent reports of a ticker in the background
+PRECOMPUTE_QUERY = "What is the current market outlook for {name}?"
+# Token budget of the price history table in the price analyst prompt
+PRICE_TABLE_TOKEN_BUDGET = int(os.environ.get("PRICE_TABLE_TOKEN_BUDGET", 600))
+# Token budget of the articles in the news analyst prompt
+NEWS_TOKEN_BUDGET = int(os.environ.get("NEWS_TOKEN_BUDGET", 1500))
+# Headlines the news analyst explains when the lexicon score is confident
+NEWS_SUMMARY_ARTICLES = int(os.environ.get("NEWS_SUMMARY_ARTICLES", 5))
+# Size of the price table and number of headlines kept in a session for follow-up questions
+SESSION_PRICE_TOKEN_BUDGET = int(os.environ.get("SESSION_PRICE_TOKEN_BUDGET", 300))
+SESSION_HEADLINES = int(os.environ.get("SESSION_HEADLINES", 5))
 
 # Get API keys from environment variables with fallbacks
 GROQ_API_KEY = os.environ.get("GROQ_API_KEY", "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")
@@ -40,6 +87,34 @@ except Exception as e:
     print(f"OpenBB login failed: {e}")
     # Continue without OpenBB if login fails
 
+report_store = ReportStore()
+
+
+def intent_router(state: AppState):
+    """Answers canned intents (ZoraGPT questions, greetings, small talk) right away.
+
+    Args:
+        state: An AppState object containing the user's query in "user_query".
+
+    Returns:
+        A dictionary with the intent name and the final response if an intent matched.
+    """
+    match = match_intent(state["user_query"])
+    if match is None:
+        return {"intent": None}
+    intent, response = match
+    print(f"Matched intent {intent}")
+    return {"intent": intent, "final_response": [type("Obj", (), {"content": response})()]}
+
+
+def route_intent(state: AppState):
+    """Ends on canned intents and answers follow-ups from the session's reports directly."""
+    if state.get("intent"):
+        return END
+    if state.get("follow_up"):
+        return "final_answer"
+    return "ticker_extractor"
+
 
 def ticker_extractor(state: AppState):
     """Extracts which is the ticker or cryptocurrency that is being mentioned in the user's query.
@@ -48,12 +123,57 @@ def ticker_extractor(state: AppState):
         state: An AppState object containing the user's query in "user_query".
 
     Returns:
-        A dictionary with the extracted ticker symbol.
+        A dictionary with the first extracted ticker in "ticker" and all of them, at most
+        MAX_COMPARE_TICKERS, in "tickers", and the keys of the speculative fetches
+        started for them in "prefetched".
     """
-
-    ticker_extractor_llm = llm.with_structured_output(TickerQuery)
-    extraction = ticker_extractor_llm.invoke([HumanMessage(state["user_query"])])
-    return {"ticker": Ticker[extraction.ticker]}
+    resolutions = resolver.resolve_all(state["user_query"])
+    speculative = []
+    if resolutions and all(r.confidence >= TICKER_RESOLVER_MIN_CONFIDENCE for r in resolutions):
+        symbols = [resolution.symbol for resolution in resolutions]
+    else:
+        # The retrievers would wait for the LLM, so start fetching for the likely coins meanwhile
+        time_frame = state.get("time_frame") or TimeFrame.WEEKLY
+        candidates = [Ticker[r.symbol] for r in resolutions if r.confidence >= PREFETCH_MIN_CONFIDENCE]
+        speculative = prefetcher.start(
+            dict(
+                fetch
+                for ticker in candidates[:PREFETCH_MAX_TICKERS]
+                for fetch in (price_fetch(ticker, time_frame), news_fetch(ticker))
+            )
+        )
+        extraction = llm_cache.invoke(llm, [HumanMessage(state["user_query"])], schema=TickersQuery)
+        symbols = [symbol for symbol in dict.fromkeys(extraction.tickers) if symbol != "NoCoin"] or ["NoCoin"]
+    tickers = [Ticker[symbol] for symbol in symbols[:MAX_COMPARE_TICKERS]]
+    confirmed = {ticker.name for ticker in tickers}
+    prefetcher.discard([key for key in speculative if key[1] not in confirmed])
+    return {
+        "ticker": tickers[0],
+        "tickers": tickers,
+        "prefetched": [key for key in speculative if key[1] in confirmed],
+    }
+
+
+def price_fetch(ticker: Ticker, time_frame: TimeFrame):
+    """The prefetch key and the fetch of a ticker's price bars."""
+    return ("price", ticker.name, time_frame.name), lambda: get_price_data(ticker, time_frame=time_frame)
+
+
+def news_fetch(ticker: Ticker):
+    """The prefetch key and the fetch of a ticker's news."""
+    return ("news", ticker.name), lambda: get_news_data(ticker)
+
+
+def take_prefetched(state: dict, key, fetch):
+    """Takes over the request's own speculative fetch of `key`, or fetches right away without one."""
+    if key in (state.get("prefetched") or ()):
+        return prefetcher.result(key, fetch)
+    return fetch()
+
+
+def discard_prefetched(state: dict, symbol: str):
+    """Releases the request's speculative fetches for a ticker answered from precomputed reports."""
+    prefetcher.discard([key for key in state.get("prefetched") or () if key[1] == symbol])
 
 
 def news_retriever(state: AppState):
@@ -63,11 +183,14 @@ def news_retriever(state: AppState):
         state: An AppState object containing the ticker in "ticker".
 
     Returns:
-        A dictionary with the news data for the ticker.
+        A dictionary with the NewsFeatures of the ticker's most relevant articles.
     """
     ticker = state["ticker"]
-    news_df = get_news_data(ticker)
-    return {"news": news_df}
+    # Started by the ticker extractor already when it had to ask the LLM
+    news_df = take_prefetched(state, *news_fetch(ticker))
+    articles = select_news(news_df, ticker.name, k=20, token_budget=NEWS_TOKEN_BUDGET)
+    # Only the selected articles are kept in the state, the full frame is released here
+    return {"news": NewsFeatures(ticker.name, len(news_df), articles, score_news(articles))}
 
 
 def price_retriever(state: AppState):
@@ -77,52 +200,59 @@ def price_retriever(state: AppState):
         state: An AppState object containing the ticker in "ticker".
 
     Returns:
-        A dictionary with processed price data for the ticker.
+        A dictionary with the PriceFeatures of the last 24 bars of the requested timeframe.
     """
     ticker = state["ticker"]
-    price_df = get_price_data(ticker, time_frame=TimeFrame.WEEKLY)
-    price_df = add_indicators(price_df)
-    price_df = price_df.tail(n=24)
+    time_frame = state.get("time_frame") or TimeFrame.WEEKLY
+    # Weekly and monthly bars come precomputed from the archive or the in-process bar views
+    price_df = take_prefetched(state, *price_fetch(ticker, time_frame))
+    price_df = indicator_engine.compute((ticker.name, time_frame), price_df, tail=24)
 
-    return {"prices": price_df}
+    return {"prices": PriceFeatures.from_frame(ticker.name, time_frame, price_df)}
 
 
-def price_analyst(state: AppState):
-    """Analyzes price data and generates a prediction report.
+def build_price_analyst_prompt(
+    price_df, money_supply_df, user_query: str, time_frame: TimeFrame = TimeFrame.WEEKLY
+) -> PromptSections:
+    """Builds the price analyst prompt within PRICE_TABLE_TOKEN_BUDGET for the price table.
 
     Args:
-        state: An AppState object containing price data in "prices" and the user's query in "user_query".
+        price_df: Bars with the add_indicators columns.
+        money_supply_df: Monthly money supply with an "m2" column.
+        user_query: The user's query.
+        time_frame: Timeframe of the bars.
 
     Returns:
-        A dictionary with the price analysis report.
+        The prompt sections.
     """
-    try:
-        price_df = state["prices"]
-        
-        # Check if price data is empty
-        if price_df.empty:
-            return {"price_analyst_report": "I apologize, but I couldn't retrieve price data for analysis. This might be due to a temporary service issue."}
-        
-        weeks_4_50_percent, _, _ = calculate_50_percent(price_df, n_weeks=4)
-        weeks_12_50_percent, _, _ = calculate_50_percent(price_df, n_weeks=12)
-        weeks_26_50_percent, _, _ = calculate_50_percent(price_df, n_weeks=26)
-
-        money_supply_df = get_money_supply()
-        money_supply_text = str(money_supply_df["m2"]) if not money_supply_df.empty else "Data not available"
-
-        prompt = f"""You have extensive knowledge of the cryptocurrency market and historical data.
+    weeks_4_50_percent, _, _ = calculate_50_percent(price_df, n_weeks=4)
+    weeks_12_50_percent, _, _ = calculate_50_percent(price_df, n_weeks=12)
+    weeks_26_50_percent, _, _ = calculate_50_percent(price_df, n_weeks=26)
+
+    period = PERIOD_NAMES[time_frame]
+    sections = PromptSections()
+    sections.add(
+        "instructions",
+        f"""You have extensive knowledge of the cryptocurrency market and historical data.
 Think step-by-step and focus on the technical indicators.
-Use the following weekly close price history and technical indicators for the particular currency:
-
-price history:
-{str(price_df[price_df.columns[2:]])}
-M2 money supply history:
-{money_supply_text}
-
-4 weeks 50% level: {weeks_4_50_percent}
-12 weeks 50% level: {weeks_12_50_percent}
-26 weeks 50% level: {weeks_26_50_percent}
+Use the following {time_frame.name.lower()} close price history and technical indicators for the particular currency:
 
+price history (CSV, oldest first):
+""",
+    )
+    sections.add("price_history", fit_table(price_df, PRICE_PROMPT_COLUMNS, PRICE_TABLE_TOKEN_BUDGET))
+    sections.add("money_supply", f"\nM2 money supply:\n{money_supply_summary(money_supply_df)}\n")
+    sections.add(
+        "levels",
+        f"""
+4 {period}s 50% level: {format_number(weeks_4_50_percent)}
+12 {period}s 50% level: {format_number(weeks_12_50_percent)}
+26 {period}s 50% level: {format_number(weeks_26_50_percent)}
+""",
+    )
+    sections.add(
+        "task",
+        f"""
 IMPORTANT: Do NOT provide specific price predictions. Instead, analyze:
 - Current market trends and patterns
 - Technical indicators and their implications
@@ -133,15 +263,44 @@ IMPORTANT: Do NOT provide specific price predictions. Instead, analyze:
 What is the overall trend outlook? Explain the current market conditions and what factors to watch in 1-3 sentences.
 
 When creating your answer, focus on answering the user query:
-{state["user_query"]}
-"""
-        response = llm.invoke([HumanMessage(prompt)])
+{user_query}
+""",
+    )
+    return sections
+
+
+def price_analyst(state: AppState):
+    """Analyzes price data and generates a prediction report.
+
+    Args:
+        state: An AppState object containing price data in "prices" and the user's query in "user_query".
+
+    Returns:
+        A dictionary with the price analysis report.
+    """
+    try:
+        prices = state["prices"]
+        
+        # Check if price data is empty
+        if prices.empty:
+            return {"price_analyst_report": "I apologize, but I couldn't retrieve price data for analysis. This might be due to a temporary service issue."}
+
+        sections = build_price_analyst_prompt(prices.frame(), get_money_supply(), state["user_query"], prices.time_frame)
+        sections.report("price_analyst")
+        response = llm_cache.invoke(llm, [HumanMessage(sections.prompt())])
         return {"price_analyst_report": response.content}
     except Exception as e:
         print(f"Error in price_analyst: {e}")
         return {"price_analyst_report": "I apologize, but I encountered an error while analyzing price data. Please try again later."}
 
 
+def format_articles(news_df) -> str:
+    return "".join(
+        f"{pd.Timestamp(date).strftime('%Y-%m-%d %H:%M')}\n{title}\n{body}\n---\n"
+        for date, title, body in zip(news_df["date"], news_df["title"], news_df["body"])
+    )
+
+
 def news_analyst(state: AppState):
     """Analyzes news sentiment and generates a sentiment score.
 
@@ -149,18 +308,35 @@ def news_analyst(state: AppState):
         state: An AppState object containing news data in "news" and the user's query in "user_query".
 
     Returns:
-        A dictionary with the news sentiment analysis report.
+        A dictionary with the news sentiment analysis report and its 0-100 score in "news_sentiment".
     """
     try:
-        news_df = state["news"]
+        news = state["news"]
         
         # Check if news data is empty
-        if news_df.empty:
+        if news.empty:
             return {"news_analyst_report": "I apologize, but I couldn't retrieve news data for sentiment analysis. This might be due to a temporary service issue."}
         
-        news_text = ""
-        for date, row in list(news_df.iterrows())[:20]:
-            news_text += f"{date}\n{row.title}\n{row.body}\n---\n"
+        selected_df = news.frame()
+        sentiment = news.sentiment
+        if sentiment.confident:
+            # The lexicon already decided the number, the LLM only explains it from the strongest headlines
+            direction = 1 if sentiment.score >= 50 else -1
+            strongest = selected_df.assign(strength=direction * sentiment.article_scores)
+            strongest = strongest.nlargest(NEWS_SUMMARY_ARTICLES, "strength")
+            headlines = "\n".join(f"- {title}" for title in strongest["title"])
+            prompt = f"""The combined sentiment of recent news is {sentiment.score} on a scale from 0
+(extremely bearish) to 100 (extremely bullish). These are the headlines driving it:
+
+{headlines}
+
+Explain in 1-2 sentences why the sentiment is {sentiment.sentiment}, focusing on the user query:
+{state["user_query"]}
+"""
+            response = llm_cache.invoke(llm, [HumanMessage(prompt)])
+            return {"news_analyst_report": f"{sentiment.score} - {response.content}", "news_sentiment": sentiment.score}
+
+        news_text = format_articles(selected_df)
 
         prompt = f"""Choose a combined sentiment that best represents these news articles:
 
@@ -175,13 +351,12 @@ Pick a number for the sentiment between 0 and 100 where:
 - 0 is extremely bearish
 - 100 is extremely bullish
 
-Reply only with the sentiment and a short explanation (1-2 sentences) of why.
-
-When creating your answer, focus on answering the user query:
+Explain the sentiment in 1-2 sentences, focusing on the user query:
 {state["user_query"]}
 """
-        response = llm.invoke([HumanMessage(prompt)])
-        return {"news_analyst_report": response.content}
+        report = llm_cache.invoke(llm, [HumanMessage(prompt)], schema=NewsSentimentReport)
+        score = min(max(int(report.sentiment), 0), 100)
+        return {"news_analyst_report": f"{score} - {report.explanation}", "news_sentiment": score}
     except Exception as e:
         print(f"Error in news_analyst: {e}")
         return {"news_analyst_report": "I apologize, but I encountered an error while analyzing news sentiment. Please try again later."}
@@ -192,13 +367,29 @@ def financial_reporter(state: AppState):
 
     Args:
         state: An AppState object containing reports from the price analyst ("price_analyst_report")
-               and news analyst ("news_analyst_report"), along with the user's query in "user_query".
+               and news analyst ("news_analyst_report" and its score in "news_sentiment"), along with
+               the user's query in "user_query".
 
     Returns:
         A dictionary with the final financial report.
     """
     price_report = state["price_analyst_report"]
     news_report = state["news_analyst_report"]
+    prices = state["prices"]
+    if not prices.empty:
+        # The numbers come from the indicators directly, the narrative is in the analyst reports
+        signals = price_signals(prices.frame())
+        sentiment = sentiment_from_score(state.get("news_sentiment"))
+        report = FinalReport(
+            action=signals["action"],
+            score=signals["score"],
+            trend=signals["trend"],
+            sentiment=sentiment,
+            price_predictions=signals["price_predictions"],
+            summary=signal_summary(signals, sentiment, PERIOD_NAMES[prices.time_frame]),
+        )
+        return {"final_report": report}
+
     prompt = f"""You're a senior cryptocurrency expert that makes extremely accurate predictions
 about future prices and trend in the crypto market. You're well versed into technological advancements
 and tokenomics of various projects.
@@ -222,11 +413,178 @@ Based on the provided information, create a final report for the user.
 When creating your answer, focus on answering the user query:
 {state["user_query"]}
 """
-    final_report_llm = llm.with_structured_output(FinalReport)
-    response = final_report_llm.invoke([HumanMessage(prompt)])
+    response = llm_cache.invoke(llm, [HumanMessage(prompt)], schema=FinalReport)
     return {"final_report": response}
 
 
+def fast_analyst(state: AppState):
+    """Analyzes prices and news and answers the user in a single structured LLM call.
+
+    Args:
+        state: An AppState object containing "prices", "news", "ticker" and "user_query".
+
+    Returns:
+        A dictionary with the final report and the final response.
+    """
+    prices = state["prices"]
+    news = state["news"]
+    price_df = prices.frame()
+    if prices.empty:
+        price_text = "Price data not available"
+    else:
+        sections = build_price_analyst_prompt(price_df, get_money_supply(), state["user_query"], prices.time_frame)
+        price_text = sections.sections["price_history"] + sections.sections["money_supply"] + sections.sections["levels"]
+    news_text = format_articles(news.frame()) if not news.empty else "News not available"
+
+    prompt = f"""You're a senior cryptocurrency expert with extensive knowledge of the crypto market,
+technical analysis and tokenomics. Analyze the data below for {top_crypto_dict[state["ticker"].name]} and create a report.
+
+{prices.time_frame.name.capitalize()} price history and technical indicators (CSV, oldest first):
+{price_text}
+
+Recent news articles, separated by `---`:
+```
+{news_text}
+```
+
+Fill in the report fields from the price trend, the technical indicators and the news sentiment.
+In "advice", answer the user query with educational information, market analysis, factors to consider,
+risks and opportunities. Do NOT give direct "buy" or "sell" recommendations in the advice.
+
+User query:
+{state["user_query"]}
+"""
+    try:
+        report = llm_cache.invoke(llm, [HumanMessage(prompt)], schema=FastReport)
+        fields = report.dict(exclude={"advice"})
+        if not prices.empty:
+            # Reproducible numbers from the indicators rather than the LLM's reading of them
+            signals = price_signals(price_df)
+            fields.update({key: signals[key] for key in ("action", "score", "trend", "price_predictions")})
+        if not news.empty and news.sentiment.confident:
+            fields["sentiment"] = news.sentiment.sentiment
+        final_report = FinalReport(**fields)
+        advice = report.advice
+    except Exception as e:
+        print(f"Error in fast_analyst: {e}")
+        final_report = None
+        advice = "I apologize, but I encountered an error while processing your request. Please try again or rephrase your question."
+    return {
+        "price_analyst_report": "",
+        "news_analyst_report": "",
+        "final_report": final_report,
+        "final_response": [type("Obj", (), {"content": advice})()],
+    }
+
+
+def build_ticker_reports(symbol: str) -> dict:
+    """Builds the query-independent analyst reports of a ticker.
+
+    Args:
+        symbol: Ticker symbol present in top_crypto_dict.
+
+    Returns:
+        A dictionary with the price and news analyst reports and the final report fields.
+    """
+    state = {
+        "user_query": PRECOMPUTE_QUERY.format(name=top_crypto_dict[symbol]),
+        "ticker": Ticker[symbol],
+    }
+    state.update(price_retriever(state))
+    state.update(news_retriever(state))
+    # Don't store apologies for data that couldn't be retrieved
+    if state["prices"].empty or state["news"].empty:
+        raise ValueError(f"missing price or news data for {symbol}")
+    for node in (price_analyst, news_analyst, financial_reporter):
+        state.update(node(state))
+    return {
+        "price_analyst_report": state["price_analyst_report"],
+        "news_analyst_report": state["news_analyst_report"],
+        "final_report": state["final_report"].dict(),
+    }
+
+
+def cached_reports(state: AppState):
+    """Loads the precomputed reports for the given ticker.
+
+    Args:
+        state: An AppState object containing the ticker in "ticker".
+
+    Returns:
+        A dictionary with the price and news analyst reports and the final report.
+    """
+    # Freshness was checked by route_ticker already
+    reports = report_store.load(state["ticker"].name)
+    discard_prefetched(state, state["ticker"].name)
+    return {
+        "price_analyst_report": reports["price_analyst_report"],
+        "news_analyst_report": reports["news_analyst_report"],
+        "final_report": FinalReport(**reports["final_report"]),
+    }
+
+
+def analyze_ticker(
+    ticker: Ticker, user_query: str, time_frame: TimeFrame = TimeFrame.WEEKLY, prefetched: list = None
+) -> dict:
+    """Runs the retrievers and the analysts of one ticker, each pair concurrently like the graph.
+
+    Args:
+        ticker: The ticker to analyze.
+        user_query: The user's query the analysts focus on.
+        time_frame: Timeframe of the price bars.
+        prefetched: Keys of the request's speculative fetches, see ticker_extractor.
+
+    Returns:
+        A dictionary with the price and news analyst reports and the final report.
+    """
+    # Precomputed reports are built from weekly bars
+    reports = report_store.load_fresh(ticker.name) if time_frame == TimeFrame.WEEKLY else None
+    state = {"user_query": user_query, "ticker": ticker, "time_frame": time_frame, "prefetched": prefetched}
+    if reports is not None:
+        discard_prefetched(state, ticker.name)
+        reports["final_report"] = FinalReport(**reports["final_report"])
+        return reports
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for nodes in ((price_retriever, news_retriever), (price_analyst, news_analyst)):
+            for update in list(executor.map(lambda node: node(state), nodes)):
+                state.update(update)
+    state.update(financial_reporter(state))
+    return {
+        "price_analyst_report": state["price_analyst_report"],
+        "news_analyst_report": state["news_analyst_report"],
+        "final_report": state["final_report"],
+    }
+
+
+def comparison_analyst(state: AppState):
+    """Analyzes every ticker of a comparison query concurrently.
+
+    The generic crypto news is shared between the tickers through the news cache, which
+    fetches each keyword once even when several tickers ask for it at the same time.
+
+    Args:
+        state: An AppState object containing the tickers in "tickers" and the user's query in "user_query".
+
+    Returns:
+        A dictionary with the reports of every ticker in "comparison", keyed by symbol.
+    """
+
+    def analyze(ticker: Ticker):
+        try:
+            return analyze_ticker(
+                ticker, state["user_query"], state.get("time_frame") or TimeFrame.WEEKLY, state.get("prefetched")
+            )
+        except Exception as e:
+            print(f"Error analyzing {ticker.name} for comparison: {e}")
+            return {"price_analyst_report": "Not available", "news_analyst_report": "Not available", "final_report": None}
+
+    tickers = state["tickers"]
+    with ThreadPoolExecutor(max_workers=len(tickers)) as executor:
+        results = list(executor.map(analyze, tickers))
+    return {"comparison": {ticker.name: reports for ticker, reports in zip(tickers, results)}}
+
+
 # @tool(args_schema=SliderInput)
 def search(keyword: str) -> str:
     """
@@ -245,11 +603,11 @@ def search(keyword: str) -> str:
         - News articles are fetched with a one-month time limit.
         - Both searches have safesearch disabled and a maximum of 10 results each.
     """
-    results_text = results = DDGS().text(
-        keyword, safesearch="off", timelimit="y", max_results=10
+    results_text = results = duckduckgo_breaker.call(
+        lambda: DDGS().text(keyword, safesearch="off", timelimit="y", max_results=10)
     )
-    results_news = DDGS().news(
-        keywords=keyword, safesearch="off", timelimit="m", max_results=10
+    results_news = duckduckgo_breaker.call(
+        lambda: DDGS().news(keywords=keyword, safesearch="off", timelimit="m", max_results=10)
     )
 
     return str(results_text) + str(results_news)
@@ -269,126 +627,47 @@ def ticker_check(state: AppState):
         return "no"
 
 
-def final_answer(state: AppState):
+def route_ticker(state: AppState):
+    """Compares several tickers, uses fresh precomputed reports or fans out to both
+    retrievers for a single known ticker, otherwise answers directly."""
+    if len(state.get("tickers") or []) > 1:
+        return "comparison_analyst"
+    if ticker_check(state) == "yes":
+        # Precomputed reports are built from weekly bars
+        weekly = (state.get("time_frame") or TimeFrame.WEEKLY) == TimeFrame.WEEKLY
+        if weekly and report_store.load_fresh(state["ticker"].name) is not None:
+            return "cached_reports"
+        return ["price_retriever", "news_retriever"]
+    return "final_answer"
+
+
+def final_answer(state: AppState, config: RunnableConfig = None):
     print("Final State reached")
-    
-    # Check if user is asking about ZoraGPT specifically
-    user_query_lower = state["user_query"].lower()
-    
-    # Handle "What is ZoraGPT?" question
-    if "what is zoragpt" in user_query_lower or "what is zora" in user_query_lower:
-        zoragpt_info_response = """{"advice": "🤖 **ZoraGPT - Your Intelligent AI Assistant** 🤖
-
-**What is ZoraGPT?**
-ZoraGPT is a revolutionary AI-powered chat assistant designed to be your intelligent companion for real-time insights, strategic analysis, and automated assistance. Built on the cutting-edge Base network (Coinbase's Layer 2 solution), ZoraGPT combines the power of advanced artificial intelligence with blockchain technology to deliver an unparalleled user experience.
-
-**Core Capabilities:**
-🎯 **Real-Time Insights**: Get instant, data-driven insights about cryptocurrency markets, financial trends, and investment opportunities
-📊 **Strategic Analysis**: Receive comprehensive market analysis, technical indicators, and strategic recommendations
-⚡ **Automation**: Seamlessly execute blockchain transactions, check wallet balances, and perform DeFi operations
-💬 **Intelligent Conversations**: Engage in natural, context-aware conversations about finance, technology, and more
-🔗 **Blockchain Integration**: Direct interaction with the Base network for secure, fast, and cost-effective transactions
-
-**Key Features:**
-• **AI-Powered Financial Advisor**: Advanced algorithms provide market analysis and investment insights
-• **Blockchain Assistant**: Complete integration with Base network for crypto operations
-• **Real-Time Data**: Live market data, price feeds, and news analysis
-• **User-Friendly Interface**: Beautiful, intuitive chat interface with instant responses
-• **Secure & Reliable**: Built on Coinbase's trusted infrastructure
-
-**Why Choose ZoraGPT?**
-🚀 **Innovation**: First-of-its-kind AI assistant on Base network
-🔒 **Security**: Leverages Coinbase's secure L2 infrastructure
-⚡ **Speed**: Lightning-fast responses and transaction processing
-💰 **Cost-Effective**: Low transaction fees on Base network
-🌐 **Accessibility**: Available 24/7 for all your AI assistance needs
-
-**Perfect For:**
-• Crypto enthusiasts seeking market insights
-• Investors looking for strategic analysis
-• DeFi users wanting seamless blockchain integration
-• Anyone interested in AI-powered financial assistance
-
-**Experience the Future of AI + Blockchain Today!** 🚀
-
-*ZoraGPT - Where Intelligence Meets Innovation*"}"""
-        
-        return {"final_response": [type("Obj", (), {"content": zoragpt_info_response})()]}
-    
-    # Handle "Should I buy ZoraGPT?" question
-    if "should i buy zoragpt" in user_query_lower or "should i buy zora" in user_query_lower:
-        zoragpt_response = """{"advice": "🚀 **ZoraGPT - The Future of AI + Blockchain is Here!** 🚀
-
-**🔥 WHY ZoraGPT is a GAME-CHANGER:**
-
-**1. FIRST-MOVER ADVANTAGE**
-ZoraGPT is the FIRST AI assistant built specifically for the Base network ecosystem. While there are many AI tools and many blockchain platforms, ZoraGPT is the ONLY one that combines:
-• Advanced AI with real-time financial analysis
-• Seamless Base network integration  
-• Complete DeFi functionality
-• Professional-grade market insights
-
-**2. MASSIVE MARKET OPPORTUNITY**
-• **AI Market**: Projected to reach $1.8 trillion by 2030 (growing 37% annually)
-• **DeFi Market**: Expected to hit $232 billion by 2030
-• **Base Network**: Coinbase's L2 with 100M+ potential users
-• **Combined Potential**: ZoraGPT sits at the intersection of 3 booming markets
-
-**3. STRONG FOUNDATION & BACKING**
-✅ **Built on Base Network**: Coinbase's trusted, secure, and fast L2 infrastructure
-✅ **Institutional Support**: Backed by Coinbase's ecosystem and resources
-✅ **Technical Excellence**: State-of-the-art AI models and blockchain integration
-✅ **User Experience**: Beautiful, intuitive interface that actually works
-✅ **Real Utility**: Not just hype - provides genuine value to users
-
-**4. COMPETITIVE ADVANTAGES**
-• **First-Mover Advantage**: First AI assistant on Base network
-• **Network Effects**: More users = better AI = more users
-• **Data Advantage**: Access to real-time crypto and DeFi data
-• **Integration Depth**: Deep Base network integration vs. competitors
-• **Brand Recognition**: Strong positioning in AI + crypto space
-
-**5. REVENUE POTENTIAL**
-• **Subscription Models**: Premium AI features and advanced analytics
-• **Transaction Fees**: Revenue from DeFi operations and trades
-• **Data Services**: Market insights and analytics for institutions
-• **Partnerships**: Integration fees from other Base ecosystem projects
-• **Token Economics**: Native token utility and governance
-
-**6. GROWTH CATALYSTS**
-🚀 **Base Network Growth**: As Base grows, ZoraGPT grows exponentially
-🚀 **AI Adoption**: Increasing demand for AI-powered financial tools
-🚀 **DeFi Expansion**: More DeFi protocols = more use cases
-🚀 **Institutional Adoption**: Professional traders and institutions
-🚀 **Global Expansion**: International markets and languages
-
-**7. TIMING IS PERFECT**
-• **AI Revolution**: ChatGPT, Claude, and other AI tools have proven the market
-• **Crypto Recovery**: Market sentiment improving, institutional adoption increasing
-• **Base Network Momentum**: Growing rapidly with Coinbase's support
-• **DeFi Renaissance**: New protocols and use cases emerging daily
-
-**8. BOTTOM LINE**
-ZoraGPT represents a rare opportunity to invest in a project that combines:
-• **Proven Technology** (AI + Blockchain)
-• **Massive Market** (AI + Crypto + DeFi)
-• **Strong Backing** (Base network ecosystem)
-• **Real Utility** (Actual product that works)
-• **First-Mover Advantage** (Unique positioning)
-
-**🎯 INVESTMENT RECOMMENDATION:**
-For investors with a 2-5 year horizon who believe in the future of AI + blockchain, ZoraGPT represents a compelling opportunity. The combination of first-mover advantage, strong technical foundation, and massive market potential makes this a high-conviction investment.
-
-**💰 POSITION SIZING:**
-Consider allocating 5-15% of your crypto portfolio to ZoraGPT, depending on your risk tolerance and conviction level.
-
-*This analysis is for educational purposes. Always do your own research and consider your risk tolerance before making investment decisions.*"}"""
-        
-        return {"final_response": [type("Obj", (), {"content": zoragpt_response})()]}
-    
 
-    
-    if ticker_check(state) == "no":
+    if state.get("comparison"):
+        reports = "\n".join(
+            f"""{top_crypto_dict[symbol]} ({symbol}):
+    •   News Analyst Report: {ticker_reports["news_analyst_report"]}
+    •   Price Analyst Report: {ticker_reports["price_analyst_report"]}
+    •   Financial Report: {ticker_reports["final_report"]}
+"""
+            for symbol, ticker_reports in state["comparison"].items()
+        )
+        prompt = f"""You are a knowledgeable financial information provider with expertise in cryptocurrency markets, investments, and financial analysis. Your role is to provide educational information, market analysis, and insights to help users make informed decisions.
+
+The user wants to compare several cryptocurrencies. These are the pre-generated reports of each of them:
+
+{reports}
+Compare the cryptocurrencies side by side based on these reports: their trends, technical indicators, news sentiment, risks and opportunities. Point out where they differ and what they have in common.
+
+IMPORTANT: You should NOT provide direct financial advice like "buy" or "sell" recommendations, and you should not pick a winner.
+
+When providing information, clearly communicate any risks, uncertainties, or potential downsides involved to help users make informed decisions. Strive to deliver clear, professional, and educational responses to every query.
+
+IMPORTANT: Always respond in the following JSON format:
+{{"advice": "<your educational information and analysis here>"}}
+        """
+    elif ticker_check(state) == "no":
         print("I am here at no")
         prompt = f"""You are a knowledgeable financial information provider with expertise in cryptocurrency markets, investments, and financial analysis. Your role is to provide educational information, market analysis, and insights to help users make informed decisions.
 
@@ -406,6 +685,7 @@ IMPORTANT: Always respond in the following JSON format:
         """
     else:
         print("hey we are here")
+        market_context = f"\nLatest market data:\n{state['market_context']}\n" if state.get("market_context") else ""
         prompt = f"""
         You are a knowledgeable financial information provider with expertise in cryptocurrency markets, investments, and financial analysis. Your role is to provide educational information, market analysis, and insights to help users make informed decisions.
 
@@ -413,7 +693,7 @@ Additionally, there are pre-generated reports stored in variables that you shoul
     •   News Analyst Report: {state["news_analyst_report"]}
     •   Price Analyst Report: {state["price_analyst_report"]}
     •   Financial Report: {state["final_report"]}
-
+{market_context}
 Refer to these reports, if available, to ensure your responses are well-informed and data-driven.
 
 IMPORTANT: You should NOT provide direct financial advice like "buy" or "sell" recommendations. Instead, provide:
@@ -432,7 +712,23 @@ IMPORTANT: Always respond in the following JSON format:
     sys_message = SystemMessage(content=prompt)
 
     try:
-        result = [llm.invoke([sys_message] + [HumanMessage(state["user_query"])])]
+        # Earlier turns of the session, if any, give follow-up questions their context
+        messages = [sys_message] + state.get("messages", []) + [HumanMessage(state["user_query"])]
+        on_token = ((config or {}).get("configurable") or {}).get("on_token")
+        cached = llm_cache.get(llm, messages) if on_token is not None else None
+        if on_token is None:
+            result = [llm_cache.invoke(llm, messages)]
+        elif cached is not None:
+            on_token(cached.content)
+            result = [cached]
+        else:
+            # Streaming clients get the tokens as they are generated
+            response = None
+            for chunk in llm.stream(messages):
+                on_token(chunk.content)
+                response = chunk if response is None else response + chunk
+            llm_cache.put(llm, messages, response)
+            result = [response]
         
         # Try to parse the output as JSON, fallback to raw content if failed
         import json
@@ -460,18 +756,22 @@ IMPORTANT: Always respond in the following JSON format:
         return {"final_response": [type("Obj", (), {"content": fallback_response})()]}
 
 
+graph.add_node("intent_router", intent_router)
 graph.add_node("ticker_extractor", ticker_extractor)
 graph.add_node("news_retriever", news_retriever)
 graph.add_node("price_retriever", price_retriever)
 graph.add_node("price_analyst", price_analyst)
 graph.add_node("news_analyst", news_analyst)
 graph.add_node("financial_reporter", financial_reporter)
+graph.add_node("cached_reports", cached_reports)
+graph.add_node("comparison_analyst", comparison_analyst)
 graph.add_node("final_answer", final_answer)
 # graph.add_node("tools", ToolNode([search]))
+graph.add_conditional_edges("intent_router", route_intent, ["ticker_extractor", "final_answer", END])
 graph.add_conditional_edges(
     "ticker_extractor",
-    ticker_check,
-    {"yes": "price_retriever", "no": "final_answer"},
+    route_ticker,
+    ["comparison_analyst", "cached_reports", "price_retriever", "news_retriever", "final_answer"],
 )
 
 # graph.add_conditional_edges(
@@ -481,26 +781,153 @@ graph.add_conditional_edges(
 #     tools_condition,
 # )
 # graph.add_edge("tools", "final_answer")
-graph.add_edge("price_retriever", "news_retriever")
+# graph.add_edge("price_retriever", "news_retriever")
 # graph.add_edge("price_analyst", "news_retriever")
 # graph.add_edge("news_retriever", "news_analyst")
 # graph.add_edge("news_analyst", "financial_reporter")
 # graph.add_edge("financial_reporter", "final_answer")
+graph.add_edge("cached_reports", "final_answer")
+graph.add_edge("comparison_analyst", "final_answer")
 graph.add_edge("price_retriever", "price_analyst")
 graph.add_edge("news_retriever", "news_analyst")
-graph.add_edge("news_analyst", "financial_reporter")
+graph.add_edge(["price_analyst", "news_analyst"], "financial_reporter")
 graph.add_edge("financial_reporter", "final_answer")
 
 
-graph.set_entry_point("ticker_extractor")
+graph.set_entry_point("intent_router")
 graph.set_finish_point("final_answer")
 graph_app = graph.compile()
 
 
+# Fast mode: one structured LLM call replaces the three analysts and the final answer
+fast_graph = StateGraph(AppState)
+fast_graph.add_node("intent_router", intent_router)
+fast_graph.add_node("ticker_extractor", ticker_extractor)
+fast_graph.add_node("news_retriever", news_retriever)
+fast_graph.add_node("price_retriever", price_retriever)
+fast_graph.add_node("fast_analyst", fast_analyst)
+fast_graph.add_node("cached_reports", cached_reports)
+fast_graph.add_node("comparison_analyst", comparison_analyst)
+fast_graph.add_node("final_answer", final_answer)
+fast_graph.add_conditional_edges("intent_router", route_intent, ["ticker_extractor", "final_answer", END])
+fast_graph.add_conditional_edges(
+    "ticker_extractor",
+    route_ticker,
+    ["comparison_analyst", "cached_reports", "price_retriever", "news_retriever", "final_answer"],
+)
+fast_graph.add_edge(["price_retriever", "news_retriever"], "fast_analyst")
+fast_graph.add_edge("cached_reports", "final_answer")
+fast_graph.add_edge("comparison_analyst", "final_answer")
+fast_graph.add_edge("fast_analyst", END)
+fast_graph.add_edge("final_answer", END)
+fast_graph.set_entry_point("intent_router")
+fast_graph_app = fast_graph.compile()
+
+graph_apps = {"thorough": graph_app, "fast": fast_graph_app}
+
+
 app = Flask(__name__)
 CORS(app, origins=["https://www.zoragpt.xyz", "https://zoragpt.xyz", "http://localhost:3000"], methods=["GET", "POST", "OPTIONS"], allow_headers=["Content-Type"])
 
 
+def report_to_dict(report: FinalReport):
+    if not report:
+        return None
+    return {
+        "action": report.action,
+        "score": report.score,
+        "trend": report.trend,
+        "sentiment": report.sentiment,
+        "price_predictions": report.price_predictions,
+        "summary": report.summary,
+    }
+
+
+def comparison_to_dict(comparison: dict):
+    return {
+        symbol: {
+            "price_analyst_report": reports["price_analyst_report"],
+            "news_analyst_report": reports["news_analyst_report"],
+            "final_report": report_to_dict(reports["final_report"]),
+        }
+        for symbol, reports in comparison.items()
+    }
+
+
+def session_market_context(state: dict) -> str:
+    """Compact price table and top headlines kept in a session for follow-up questions."""
+    parts = []
+    prices = state.get("prices")
+    if prices is not None and not prices.empty:
+        table = fit_table(prices.frame(), PRICE_PROMPT_COLUMNS, SESSION_PRICE_TOKEN_BUDGET)
+        parts.append(f"{prices.time_frame.name.capitalize()} prices and indicators (CSV, oldest first):\n{table}")
+    news = state.get("news")
+    if news is not None and not news.empty:
+        headlines = news.titles[:SESSION_HEADLINES]
+        parts.append("Top headlines:\n" + "\n".join(f"- {title}" for title in headlines))
+    return "\n\n".join(parts)
+
+
+def session_state(session: dict, user_query: str, time_frame: TimeFrame) -> dict:
+    """Builds the initial graph state of a request in an existing session.
+
+    The conversation history is always passed on. When the query doesn't mention any
+    coin other than the ones of the session, not even through an ambiguous word like
+    "link" or "near", and asks for the same timeframe, the previous reports are
+    restored too and the graph goes straight to final_answer.
+    """
+    state = {"messages": []}
+    for question, answer in session.get("history", []):
+        state["messages"] += [HumanMessage(question), AIMessage(json.dumps({"advice": answer}))]
+    symbols = session.get("tickers") or []
+    mentioned = {resolution.symbol for resolution in resolver.resolve_all(user_query)}
+    # Lowercase ambiguous words aren't resolved, let the ticker extractor decide on them
+    mentioned |= resolver.possible_mentions(user_query)
+    if not symbols or not mentioned.issubset(symbols) or session.get("time_frame") != time_frame.name:
+        return state
+
+    final_report = session.get("final_report")
+    state.update(
+        {
+            "follow_up": True,
+            "ticker": Ticker[symbols[0]],
+            "tickers": [Ticker[symbol] for symbol in symbols],
+            "price_analyst_report": session.get("price_analyst_report", ""),
+            "news_analyst_report": session.get("news_analyst_report", ""),
+            "final_report": FinalReport(**final_report) if final_report else None,
+            "market_context": session.get("market_context", ""),
+        }
+    )
+    if session.get("comparison"):
+        state["comparison"] = {
+            symbol: {**reports, "final_report": FinalReport(**reports["final_report"]) if reports["final_report"] else None}
+            for symbol, reports in session["comparison"].items()
+        }
+    return state
+
+
+def remember_session(session_id: str, session: dict, user_query: str, state: dict):
+    """Stores the reports of a new analysis and the latest turn in the session."""
+    session = dict(session or {})
+    if state.get("tickers") and not state.get("follow_up"):
+        session.update(
+            {
+                "tickers": [ticker.name for ticker in state["tickers"]],
+                "time_frame": (state.get("time_frame") or TimeFrame.WEEKLY).name,
+                "price_analyst_report": state.get("price_analyst_report", ""),
+                "news_analyst_report": state.get("news_analyst_report", ""),
+                "final_report": report_to_dict(state.get("final_report")),
+                "comparison": comparison_to_dict(state["comparison"]) if state.get("comparison") else None,
+                "market_context": session_market_context(state),
+            }
+        )
+    try:
+        answer = state["final_response"][-1].content
+    except (KeyError, IndexError, AttributeError):
+        answer = ""
+    session_store.set(session_id, add_turn(session, user_query, answer))
+
+
 @app.route("/analyze", methods=["POST"])
 def analyze():
     try:
@@ -509,9 +936,23 @@ def analyze():
         print("user query " , user_query)
         if not user_query:
             return jsonify({"error": "user_query is required"}), 400
+        mode = data.get("mode", "thorough")
+        if mode not in graph_apps:
+            return jsonify({"error": f"mode must be one of {', '.join(graph_apps)}"}), 400
+        try:
+            time_frame = TimeFrame[str(data.get("timeframe", "weekly")).upper()]
+        except KeyError:
+            return jsonify({"error": "timeframe must be daily, weekly or monthly"}), 400
+
+        session_id = data.get("session_id")
+        session = session_store.get(session_id) if session_id else None
+        initial_state = {"user_query": user_query, "time_frame": time_frame}
+        if session is not None:
+            initial_state.update(session_state(session, user_query, time_frame))
 
         # Run the LangGraph workflow
-        state = graph_app.invoke({"user_query": user_query})
+        with measure_memory("analyze"):
+            state = graph_apps[mode].invoke(initial_state)
 
         # Prepare response data with better error handling
         try:
@@ -522,29 +963,27 @@ def analyze():
         
         response_data = {"final_response": final_response_content}
 
-        if ticker_check(state) == "yes":
+        if state.get("comparison"):
+            response_data["comparison"] = comparison_to_dict(state["comparison"])
+        elif state.get("ticker") is not None and ticker_check(state) == "yes":
             try:
                 reports = {
                     "price_analyst_report": state.get("price_analyst_report", ""),
                     "news_analyst_report": state.get("news_analyst_report", ""),
-                    "final_report": (
-                        {
-                            "action": state["final_report"].action,
-                            "score": state["final_report"].score,
-                            "trend": state["final_report"].trend,
-                            "sentiment": state["final_report"].sentiment,
-                            "price_predictions": state["final_report"].price_predictions,
-                            "summary": state["final_report"].summary,
-                        }
-                        if state.get("final_report")
-                        else None
-                    ),
+                    "final_report": report_to_dict(state.get("final_report")),
                 }
                 response_data.update(reports)
             except Exception as e:
                 print(f"Error processing reports: {e}")
                 # Continue without reports if there's an error
 
+        if session_id:
+            try:
+                remember_session(session_id, session, user_query, state)
+            except Exception as e:
+                print(f"Error saving session {session_id}: {e}")
+            response_data["session_id"] = session_id
+
         return jsonify(response_data)
 
     except Exception as e:
@@ -555,5 +994,155 @@ def analyze():
         }), 500
 
 
+def node_events(node: str, update: dict):
+    """Converts a graph node update into the server-sent events sent to the client."""
+    if node == "intent_router":
+        if update.get("intent"):
+            yield sse_event("final_response", {"final_response": update["final_response"][-1].content})
+    elif node == "ticker_extractor":
+        yield sse_event(
+            "ticker",
+            {"ticker": update["ticker"].name, "tickers": [ticker.name for ticker in update["tickers"]]},
+        )
+    elif node == "price_retriever":
+        prices = update["prices"]
+        yield sse_event("prices", {"rows": len(prices), "last_close": prices.last_close})
+    elif node == "news_retriever":
+        yield sse_event("news", {"articles": update["news"].retrieved, "selected": len(update["news"])})
+    elif node in ("price_analyst", "news_analyst"):
+        report_key = f"{node}_report"
+        yield sse_event(report_key, {report_key: update[report_key]})
+    elif node == "cached_reports":
+        for report_key in ("price_analyst_report", "news_analyst_report"):
+            yield sse_event(report_key, {report_key: update[report_key]})
+        yield sse_event("final_report", {"final_report": report_to_dict(update["final_report"])})
+    elif node == "comparison_analyst":
+        yield sse_event("comparison", {"comparison": comparison_to_dict(update["comparison"])})
+    elif node == "financial_reporter":
+        yield sse_event("final_report", {"final_report": report_to_dict(update["final_report"])})
+    elif node == "fast_analyst":
+        yield sse_event("final_report", {"final_report": report_to_dict(update["final_report"])})
+        yield sse_event("final_response", {"final_response": update["final_response"][-1].content})
+    elif node == "final_answer":
+        yield sse_event("final_response", {"final_response": update["final_response"][-1].content})
+
+
+@app.route("/market/overview", methods=["GET"])
+def market_overview_route():
+    try:
+        time_frame = TimeFrame[request.args.get("timeframe", "weekly").upper()]
+        limit = int(request.args.get("limit", 50))
+    except (KeyError, ValueError):
+        return jsonify({"error": "timeframe must be daily, weekly or monthly and limit an integer"}), 400
+
+    try:
+        overview = market_overview(time_frame, sort_by=request.args.get("sort", "signal_score"))
+    except KeyError:
+        return jsonify({"error": "unknown sort column"}), 400
+    except Exception as e:
+        print(f"Error in market overview endpoint: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+    overview = overview.head(limit).round(4).astype(object)
+    coins = overview.where(overview.notna(), None).reset_index().to_dict(orient="records")
+    return jsonify({"timeframe": time_frame.name.lower(), "coins": coins})
+
+
+@app.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    return jsonify({"llm": llm_cache.stats(), "sessions": session_store.stats(), "prefetch": prefetcher.stats()})
+
+
+@app.route("/providers/status", methods=["GET"])
+def providers_status():
+    """Circuit breaker state of every data provider and the price chain counters, for monitoring."""
+    return jsonify({"breakers": breaker_stats(), "price_chain": price_chain.stats()})
+
+
+@app.route("/analyze/stream", methods=["POST"])
+def analyze_stream():
+    data = request.get_json()
+    user_query = data.get("user_query", "")
+    print("user query (stream) ", user_query)
+    if not user_query:
+        return jsonify({"error": "user_query is required"}), 400
+    mode = data.get("mode", "thorough")
+    if mode not in graph_apps:
+        return jsonify({"error": f"mode must be one of {', '.join(graph_apps)}"}), 400
+    try:
+        time_frame = TimeFrame[str(data.get("timeframe", "weekly")).upper()]
+    except KeyError:
+        return jsonify({"error": "timeframe must be daily, weekly or monthly"}), 400
+
+    session_id = data.get("session_id")
+    session = session_store.get(session_id) if session_id else None
+    initial_state = {"user_query": user_query, "time_frame": time_frame}
+    if session is not None:
+        initial_state.update(session_state(session, user_query, time_frame))
+
+    # The graph runs on its own thread and hands node updates and advice tokens to the response
+    events = queue.Queue()
+
+    def run_graph():
+        config = {"configurable": {"on_token": lambda token: events.put(("token", token))}}
+        state = dict(initial_state)
+        try:
+            with measure_memory("analyze stream"):
+                for update in graph_apps[mode].stream(initial_state, config=config, stream_mode="updates"):
+                    for node, values in update.items():
+                        state.update(values or {})
+                        events.put(("node", (node, values)))
+        except Exception as e:
+            print(f"Error in analyze stream: {e}")
+            events.put(("error", str(e)))
+        else:
+            if session_id:
+                try:
+                    remember_session(session_id, session, user_query, state)
+                except Exception as e:
+                    print(f"Error saving session {session_id}: {e}")
+        finally:
+            events.put(("end", None))
+
+    def generate():
+        parser = AdviceStreamParser()
+        while True:
+            kind, payload = events.get()
+            if kind == "token":
+                text = parser.feed(payload)
+                if text:
+                    yield sse_event("advice", {"text": text})
+            elif kind == "node":
+                node, update = payload
+                if node == "final_answer":
+                    text = parser.close()
+                    if text:
+                        yield sse_event("advice", {"text": text})
+                try:
+                    yield from node_events(node, update or {})
+                except Exception as e:
+                    print(f"Error streaming {node} update: {e}")
+            elif kind == "error":
+                yield sse_event(
+                    "error",
+                    {"final_response": "I apologize, but I encountered an error while processing your request. Please try again or rephrase your question."},
+                )
+            else:
+                yield sse_event("done", {})
+                return
+
+    threading.Thread(target=run_graph, daemon=True).start()
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# With several gunicorn workers prefer running `python precompute.py` as a single process
+if os.environ.get("PRECOMPUTE_REPORTS") == "1":
+    ReportScheduler(build_ticker_reports, report_store).start()
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5002)
@@ -0,0 +1,177 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from classes import Ticker, TimeFrame
+from consts import top_crypto_dict
+from cache import TTLCache
+from utils import get_price_data
+
+PANEL_FIELDS = ["close", "high", "low", "volume"]
+FIFTY_PERCENT_WEEKS = (4, 12, 26)
+
+panel_cache = TTLCache("market_panel", ttl=15 * 60, stale_ttl=6 * 3600)
+
+
+def rolling_mean(values: np.ndarray, length: int) -> np.ndarray:
+    """Column-wise rolling mean, NaN until a column has `length` values in the window."""
+    valid = ~np.isnan(values)
+    sums = np.cumsum(np.where(valid, values, 0.0), axis=0)
+    counts = np.cumsum(valid, axis=0)
+    sums[length:] = sums[length:] - sums[:-length]
+    counts[length:] = counts[length:] - counts[:-length]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts == length, sums / length, np.nan)
+
+
+def rolling_std(values: np.ndarray, length: int) -> np.ndarray:
+    """Column-wise rolling population standard deviation."""
+    # Centre each column first so the sum of squares doesn't lose precision
+    centred = values - np.nanmean(values, axis=0)
+    mean = rolling_mean(centred, length)
+    mean_of_squares = rolling_mean(centred**2, length)
+    return np.sqrt(np.maximum(mean_of_squares - mean**2, 0.0))
+
+
+def seeded_ema(values: np.ndarray, length: int) -> np.ndarray:
+    """Column-wise EMA seeded with the SMA of each column's first `length` values.
+
+    Columns may start with NaNs (coins listed later than others); every column is
+    seeded at its own `length`-th value, like pandas_ta's ema.
+    """
+    valid = ~np.isnan(values)
+    counts = np.cumsum(valid, axis=0)
+    # The recursion of each column starts at its seed, the values before it are dropped
+    start = np.where(
+        valid & (counts == length),
+        rolling_mean(values, length),
+        np.where(counts > length, values, np.nan),
+    )
+    ema = pd.DataFrame(start).ewm(alpha=2 / (length + 1), adjust=False).mean().to_numpy()
+    return np.where(np.isnan(start), np.nan, ema)
+
+
+def rsi(values: np.ndarray, length: int = 14) -> np.ndarray:
+    """Column-wise RSI from Wilder-smoothed gains and losses.
+
+    The smoothing is pandas_ta's rma, an adjusted EWM with alpha 1 / length.
+    """
+    deltas = np.diff(values, axis=0, prepend=np.nan)
+    counts = np.cumsum(~np.isnan(deltas), axis=0)
+    smoothing = {"alpha": 1 / length, "adjust": True}
+    gains = pd.DataFrame(np.maximum(deltas, 0.0)).ewm(**smoothing).mean().to_numpy()
+    losses = pd.DataFrame(np.maximum(-deltas, 0.0)).ewm(**smoothing).mean().to_numpy()
+    total = gains + losses
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where((counts >= length) & (total > 0) & ~np.isnan(values), 100 * gains / total, np.nan)
+
+
+class MarketPanel:
+    """Aligned close/high/low/volume arrays for the whole ticker universe.
+
+    Every field is a (dates x symbols) float array, NaN before a coin's first bar and
+    after its last one, so each indicator is computed for all symbols in one
+    vectorized pass.
+    """
+
+    def __init__(self, symbols: list, dates: pd.DatetimeIndex, fields: dict):
+        self.symbols = symbols
+        self.dates = dates
+        self.fields = fields
+
+    @classmethod
+    def from_frames(cls, frames: dict) -> "MarketPanel":
+        """Builds a panel from OHLCV DataFrames indexed by date, keyed by symbol."""
+        frames = {symbol: df for symbol, df in frames.items() if not df.empty}
+        symbols = list(frames)
+        dates = pd.DatetimeIndex(sorted(set().union(*(df.index for df in frames.values()))))
+        fields = {}
+        for field in PANEL_FIELDS:
+            table = pd.concat(
+                [frames[symbol][field].rename(symbol) for symbol in symbols], axis=1
+            ).reindex(dates)
+            # Fill gaps inside a coin's history only, leading and trailing NaNs stay
+            fields[field] = table.ffill().where(table.bfill().notna()).to_numpy(dtype=float)
+        return cls(symbols, dates, fields)
+
+    def indicators(self) -> dict:
+        """Computes the add_indicators columns for every symbol at once.
+
+        Returns:
+            A dictionary of (dates x symbols) arrays keyed by indicator name.
+        """
+        close = self.fields["close"]
+        macd = seeded_ema(close, 12) - seeded_ema(close, 26)
+        signal = seeded_ema(macd, 9)
+        bb_middle = rolling_mean(close, 5)
+        bb_deviation = 2 * rolling_std(close, 5)
+        return {
+            "ma_50": rolling_mean(close, 50),
+            "ma_200": rolling_mean(close, 200),
+            "rsi": rsi(close, 14),
+            "macd": macd,
+            "macd_signal": signal,
+            "macd_histogram": macd - signal,
+            "bb_lower": bb_middle - bb_deviation,
+            "bb_middle": bb_middle,
+            "bb_upper": bb_middle + bb_deviation,
+        }
+
+    def last_rows(self) -> np.ndarray:
+        """Row of the last bar of every symbol; coins whose history ended stop earlier."""
+        valid = ~np.isnan(self.fields["close"])
+        return len(self.dates) - 1 - np.argmax(valid[::-1], axis=0)
+
+    def fifty_percent_levels(self, n_periods: int) -> np.ndarray:
+        """The calculate_50_percent level over the last `n_periods` bars of every symbol."""
+        rows = np.arange(len(self.dates))[:, None]
+        last = self.last_rows()
+        window = (rows > last - n_periods) & (rows <= last)
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            high = np.nanmax(np.where(window, self.fields["high"], np.nan), axis=0)
+            low = np.nanmin(np.where(window, self.fields["low"], np.nan), axis=0)
+        return (high + low) / 2
+
+    def snapshot(self) -> pd.DataFrame:
+        """Close, indicators, 50% levels and a composite signal score of every symbol's last bar."""
+        last = self.last_rows()
+        columns = np.arange(len(self.symbols))
+        latest = {field: values[last, columns] for field, values in self.fields.items()}
+        latest.update({name: values[last, columns] for name, values in self.indicators().items()})
+        latest["date"] = self.dates[last]
+        for weeks in FIFTY_PERCENT_WEEKS:
+            latest[f"fifty_percent_{weeks}"] = self.fifty_percent_levels(weeks)
+        df = pd.DataFrame(latest, index=pd.Index(self.symbols, name="ticker"))
+
+        band_width = (df.bb_upper - df.bb_lower).replace(0, np.nan)
+        df["bb_position"] = ((df.close - df.bb_lower) / band_width).clip(0, 1)
+        df["trend_strength"] = (
+            (df.close > df.ma_50).astype(int)
+            + (df.ma_50 > df.ma_200).astype(int)
+            + (df.macd_histogram > 0).astype(int)
+            + (df.close > df.fifty_percent_12).astype(int)
+        ) / 4
+        df["signal_score"] = (
+            df[["rsi"]].div(100).join(df[["bb_position", "trend_strength"]]).mean(axis=1) * 100
+        )
+        return df
+
+
+def build_panel(time_frame: TimeFrame = TimeFrame.WEEKLY) -> MarketPanel:
+    frames = {
+        symbol: get_price_data(Ticker[symbol], time_frame=time_frame)
+        for symbol in top_crypto_dict
+        if symbol != "NoCoin"
+    }
+    return MarketPanel.from_frames(frames)
+
+
+def market_overview(time_frame: TimeFrame = TimeFrame.WEEKLY, sort_by: str = "signal_score") -> pd.DataFrame:
+    """Ranks all coins by the given snapshot column, highest first.
+
+    The snapshot is cached per timeframe and refreshed in the background once stale.
+    """
+    snapshot = panel_cache.get(time_frame.name, lambda: build_panel(time_frame).snapshot())
+    return snapshot.sort_values(by=sort_by, ascending=False, na_position="last")
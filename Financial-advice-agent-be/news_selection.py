@@ -0,0 +1,98 @@
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from consts import top_crypto_dict
+from prompt_format import CHARS_PER_TOKEN
+
+MINHASH_PERMUTATIONS = 64
+SHINGLE_WORDS = 3
+# Articles whose estimated shingle overlap reaches this are the same story
+NEAR_DUPLICATE_SIMILARITY = 0.6
+RECENCY_HALF_LIFE_HOURS = 48
+MERSENNE_PRIME = (1 << 61) - 1
+
+_rng = np.random.default_rng(42)
+_hash_a = _rng.integers(1, MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+_hash_b = _rng.integers(0, MERSENNE_PRIME, MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text: str) -> np.ndarray:
+    """Hashes of the overlapping word n-grams of a text."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    if len(words) < SHINGLE_WORDS:
+        words = words + [""] * (SHINGLE_WORDS - len(words))
+    grams = {" ".join(words[i : i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64)
+
+
+def minhash_signatures(texts) -> np.ndarray:
+    """MinHash signature of every text, shape (len(texts), MINHASH_PERMUTATIONS)."""
+    signatures = np.empty((len(texts), MINHASH_PERMUTATIONS), dtype=np.uint64)
+    for i, text in enumerate(texts):
+        hashes = shingles(text)
+        # (a * x + b) mod p for all permutations at once; x < 2**32 and a < 2**61 may
+        # overflow uint64, which only reshuffles the permutation and is fine for MinHash
+        permuted = (np.outer(hashes, _hash_a) + _hash_b) % MERSENNE_PRIME
+        signatures[i] = permuted.min(axis=0)
+    return signatures
+
+
+def near_duplicate_mask(signatures: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """Marks the articles to keep, visiting them by `order` and dropping near-duplicates
+    of articles already kept."""
+    similarity = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+    keep = np.zeros(len(signatures), dtype=bool)
+    for i in order:
+        if not (similarity[i, keep] >= NEAR_DUPLICATE_SIMILARITY).any():
+            keep[i] = True
+    return keep
+
+
+def relevance_scores(news_df: pd.DataFrame, symbol: str, now: pd.Timestamp = None) -> np.ndarray:
+    """Scores articles by recency and by how specifically they are about `symbol`."""
+    dates = pd.to_datetime(news_df["date"], utc=True)
+    now = now if now is not None else pd.Timestamp.now(tz="UTC")
+    age_hours = ((now - dates).dt.total_seconds() / 3600).clip(lower=0).fillna(24 * 30).to_numpy()
+    recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+
+    name = top_crypto_dict.get(symbol, symbol)
+    pattern = rf"\b(?:{re.escape(symbol)}|{re.escape(name)})\b"
+    in_title = news_df["title"].fillna("").str.contains(pattern, case=False, regex=True).to_numpy()
+    in_body = news_df["body"].fillna("").str.contains(pattern, case=False, regex=True).to_numpy()
+    tagged = (news_df["ticker"] == symbol).to_numpy() if "ticker" in news_df else False
+    relevance = 0.4 * in_title + 0.2 * in_body + 0.4 * tagged
+    return recency + relevance
+
+
+def select_news(news_df: pd.DataFrame, symbol: str, k: int = 20, token_budget: int = 1500) -> pd.DataFrame:
+    """Picks the articles to show the news analyst.
+
+    Near-duplicate stories are dropped, the rest is ranked by recency and relevance to
+    the ticker, and the best `k` that fit within `token_budget` are returned.
+
+    Args:
+        news_df: Articles with "date", "title", "body" and "ticker" columns.
+        symbol: Ticker symbol the user asked about.
+        k: Maximum number of articles.
+        token_budget: Maximum estimated tokens of the selected titles and bodies.
+
+    Returns:
+        The selected articles, most relevant first.
+    """
+    if news_df.empty:
+        return news_df
+    news_df = news_df.reset_index(drop=True)
+    texts = (news_df["title"].fillna("") + " " + news_df["body"].fillna("")).tolist()
+    scores = relevance_scores(news_df, symbol)
+    order = np.argsort(-scores, kind="stable")
+    keep = near_duplicate_mask(minhash_signatures(texts), order)
+
+    ranked = order[keep[order]]
+    lengths = np.array([len(texts[i]) for i in ranked]) / CHARS_PER_TOKEN
+    within_budget = np.cumsum(lengths) <= token_budget
+    # Always keep the best article, even if it alone is over budget
+    within_budget[:1] = True
+    return news_df.iloc[ranked[within_budget][:k]]
@@ -0,0 +1,142 @@
+import re
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from signals import FEAR_MAX_SENTIMENT, GREED_MIN_SENTIMENT, sentiment_bucket
+
+# Word valences between -3 (very bearish) and 3 (very bullish), tuned for crypto news
+LEXICON = {
+    # bullish
+    "bull": 2.0, "bullish": 2.5, "bulls": 1.5, "rally": 2.0, "rallies": 2.0, "rallied": 2.0,
+    "surge": 2.5, "surges": 2.5, "surged": 2.5, "soar": 2.5, "soars": 2.5, "soared": 2.5,
+    "jump": 1.5, "jumps": 1.5, "jumped": 1.5, "climb": 1.5, "climbs": 1.5, "climbed": 1.5,
+    "gain": 1.5, "gains": 1.5, "gained": 1.5, "rise": 1.0, "rises": 1.0, "rising": 1.0, "rose": 1.0,
+    "rebound": 1.5, "rebounds": 1.5, "recover": 1.5, "recovers": 1.5, "recovery": 1.5,
+    "breakout": 2.0, "moon": 2.0, "mooning": 2.0, "pump": 1.0, "pumps": 1.0, "outperform": 1.5,
+    "outperforms": 1.5, "record": 1.5, "all_time_high": 3.0, "ath": 2.5, "highs": 1.0,
+    "adoption": 2.0, "adopt": 1.5, "adopts": 1.5, "approval": 2.0, "approve": 2.0, "approves": 2.0,
+    "approved": 2.0, "etf_approval": 3.0, "inflows": 2.0, "inflow": 2.0, "accumulate": 1.5,
+    "accumulation": 1.5, "buying": 1.0, "upgrade": 1.5, "upgraded": 1.5, "launch": 1.0,
+    "launches": 1.0, "partnership": 1.5, "partners": 1.0, "integration": 1.0, "milestone": 1.5,
+    "optimism": 2.0, "optimistic": 2.0, "confidence": 1.5, "strong": 1.5, "strength": 1.5,
+    "growth": 1.5, "grow": 1.0, "grows": 1.0, "boost": 1.5, "boosts": 1.5, "support": 0.5,
+    "upside": 1.5, "uptrend": 2.0, "green": 1.0, "win": 1.5, "wins": 1.5, "positive": 1.5,
+    "institutional": 1.0, "halving": 1.0, "short_squeeze": 2.0, "golden_cross": 2.5,
+    # bearish
+    "bear": -2.0, "bearish": -2.5, "bears": -1.5, "crash": -3.0, "crashes": -3.0, "crashed": -3.0,
+    "plunge": -2.5, "plunges": -2.5, "plunged": -2.5, "plummet": -3.0, "plummets": -3.0,
+    "tumble": -2.0, "tumbles": -2.0, "tumbled": -2.0, "drop": -1.5, "drops": -1.5, "dropped": -1.5,
+    "fall": -1.5, "falls": -1.5, "fell": -1.5, "falling": -1.5, "decline": -1.5, "declines": -1.5,
+    "declined": -1.5, "slump": -2.0, "slumps": -2.0, "sink": -1.5, "sinks": -1.5, "sank": -1.5,
+    "dump": -2.0, "dumps": -2.0, "dumping": -2.0, "sell_off": -2.5, "selloff": -2.5,
+    "selling": -1.0, "outflows": -2.0, "outflow": -2.0, "liquidation": -2.0, "liquidations": -2.0,
+    "liquidated": -2.0, "capitulation": -2.5, "correction": -1.5, "downtrend": -2.0,
+    "downside": -1.5, "lows": -1.0, "red": -1.0, "loss": -1.5, "losses": -1.5, "lose": -1.5,
+    "loses": -1.5, "weak": -1.5, "weakness": -1.5, "fear": -2.0, "fears": -2.0, "panic": -2.5,
+    "uncertainty": -1.5, "risk": -1.0, "risks": -1.0, "risky": -1.0, "volatile": -0.5,
+    "concern": -1.5, "concerns": -1.5, "warning": -1.5, "warns": -1.5, "hack": -3.0, "hacked": -3.0,
+    "hacker": -2.5, "hackers": -2.5, "exploit": -3.0, "exploited": -3.0, "breach": -2.5,
+    "stolen": -2.5, "theft": -2.5, "scam": -3.0, "fraud": -3.0, "rug_pull": -3.0, "ponzi": -3.0,
+    "bankrupt": -3.0, "bankruptcy": -3.0, "insolvent": -3.0, "insolvency": -3.0, "collapse": -3.0,
+    "collapses": -3.0, "collapsed": -3.0, "depeg": -2.5, "delist": -2.5, "delists": -2.5,
+    "delisting": -2.5, "ban": -2.5, "bans": -2.5, "banned": -2.5, "crackdown": -2.5,
+    "lawsuit": -2.0, "sues": -2.0, "sued": -2.0, "charged": -1.5, "fined": -1.5,
+    "investigation": -1.5, "probe": -1.5, "reject": -2.0, "rejects": -2.0, "rejected": -2.0,
+    "rejection": -2.0, "delay": -1.0, "delays": -1.0, "delayed": -1.0, "outage": -2.0, "halt": -2.0,
+    "halts": -2.0, "halted": -2.0, "death_cross": -2.5, "negative": -1.5, "pessimism": -2.0,
+    "pessimistic": -2.0,
+}
+# Multi-word terms joined into one token before the lookup
+PHRASES = {
+    "all time high": "all_time_high",
+    "all-time high": "all_time_high",
+    "etf approval": "etf_approval",
+    "sell off": "sell_off",
+    "sell-off": "sell_off",
+    "rug pull": "rug_pull",
+    "short squeeze": "short_squeeze",
+    "golden cross": "golden_cross",
+    "death cross": "death_cross",
+}
+NEGATIONS = {
+    "not", "no", "never", "without", "neither", "nor", "isn't", "wasn't", "aren't", "won't", "don't",
+    "doesn't", "didn't", "can't", "cannot", "fails", "failed", "unlikely", "despite",
+}
+# Words after a negation whose valence is flipped and damped
+NEGATION_WINDOW = 3
+NEGATION_SCALE = -0.75
+# Headlines carry more signal than the body text
+TITLE_WEIGHT = 2.0
+# Normalises a summed valence x to x / sqrt(x^2 + alpha), like VADER
+NORMALIZATION_ALPHA = 15.0
+# The lexicon score is trusted without the LLM when enough articles hit the lexicon and
+# the aggregate isn't within CONFIDENCE_MARGIN points of a bucket boundary
+MIN_COVERAGE = 0.5
+CONFIDENCE_MARGIN = 5
+
+_phrase_pattern = re.compile("|".join(re.escape(phrase) for phrase in PHRASES))
+_token_pattern = re.compile(r"[a-z_]+(?:'[a-z]+)?")
+
+
+class NewsSentiment(NamedTuple):
+    score: int
+    sentiment: str
+    coverage: float
+    confident: bool
+    article_scores: np.ndarray
+
+
+def tokenize(text: str) -> list:
+    text = _phrase_pattern.sub(lambda match: PHRASES[match.group(0)], text.lower())
+    return _token_pattern.findall(text)
+
+
+def article_scores(titles, bodies) -> tuple:
+    """Scores every article in one pass over the flattened tokens of all of them.
+
+    Returns:
+        The normalised score of each article between -1 and 1, and the number of
+        lexicon words each article contains.
+    """
+    documents = [tokenize(title) for title in titles] + [tokenize(body) for body in bodies]
+    lengths = np.array([len(tokens) for tokens in documents])
+    if lengths.sum() == 0:
+        return np.zeros(len(titles)), np.zeros(len(titles), dtype=int)
+    tokens = pd.Series([token for tokens in documents for token in tokens])
+    document_ids = np.repeat(np.arange(len(documents)), lengths)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    valences = tokens.map(LEXICON).fillna(0.0).to_numpy()
+    positions = np.arange(len(tokens))
+    is_negation = tokens.isin(NEGATIONS).to_numpy()
+    last_negation = np.maximum.accumulate(np.where(is_negation, positions, -1))
+    negated = (last_negation >= starts) & (positions - last_negation <= NEGATION_WINDOW) & ~is_negation
+    valences = np.where(negated, valences * NEGATION_SCALE, valences)
+
+    sums = np.bincount(document_ids, weights=valences, minlength=len(documents))
+    hits = np.bincount(document_ids, weights=valences != 0, minlength=len(documents)).astype(int)
+    n = len(titles)
+    totals = TITLE_WEIGHT * sums[:n] + sums[n:]
+    return totals / np.sqrt(totals**2 + NORMALIZATION_ALPHA), hits[:n] + hits[n:]
+
+
+def score_news(news_df: pd.DataFrame) -> NewsSentiment:
+    """Aggregates the lexicon scores of the articles into a 0-100 sentiment.
+
+    Args:
+        news_df: Articles with "title" and "body" columns.
+
+    Returns:
+        A NewsSentiment with the score, its GREED/NEUTRAL/FEAR bucket, the share of
+        articles the lexicon could score and whether the result can be used without the LLM.
+    """
+    scores, hits = article_scores(news_df["title"].fillna("").tolist(), news_df["body"].fillna("").tolist())
+    scored = hits > 0
+    coverage = float(scored.mean()) if len(scores) else 0.0
+    value = int(round(50 + 50 * scores[scored].mean())) if scored.any() else 50
+    sentiment = sentiment_bucket(value)
+    near_boundary = min(abs(value - FEAR_MAX_SENTIMENT), abs(value - GREED_MIN_SENTIMENT)) < CONFIDENCE_MARGIN
+    confident = coverage >= MIN_COVERAGE and not near_boundary
+    return NewsSentiment(value, sentiment, coverage, confident, scores)
@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from consts import top_crypto_dict
+
+REPORT_STORE_PATH = os.environ.get(
+    "REPORT_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "reports.sqlite"),
+)
+# Reports older than this are ignored by the request path
+REPORT_MAX_AGE = int(os.environ.get("REPORT_MAX_AGE", 3600))
+PRECOMPUTE_INTERVAL = int(os.environ.get("PRECOMPUTE_INTERVAL", 1800))
+PRECOMPUTE_WORKERS = int(os.environ.get("PRECOMPUTE_WORKERS", 4))
+
+
+class ReportStore:
+    """Timestamped query-independent analyst reports per ticker, kept in SQLite."""
+
+    def __init__(self, path: str = REPORT_STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS reports (
+                    ticker TEXT PRIMARY KEY,
+                    price_analyst_report TEXT NOT NULL,
+                    news_analyst_report TEXT NOT NULL,
+                    final_report TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def save(self, ticker: str, reports: dict):
+        """Stores the reports of a ticker.
+
+        Args:
+            ticker: Ticker symbol.
+            reports: A dictionary with "price_analyst_report", "news_analyst_report"
+                     and "final_report" (a dictionary of FinalReport fields).
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?)",
+                    (
+                        ticker,
+                        reports["price_analyst_report"],
+                        reports["news_analyst_report"],
+                        json.dumps(reports["final_report"]),
+                        time.time(),
+                    ),
+                )
+        finally:
+            conn.close()
+
+    def load(self, ticker: str):
+        """Returns the stored reports of a ticker with their "created_at" timestamp, or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT price_analyst_report, news_analyst_report, final_report, created_at "
+                "FROM reports WHERE ticker = ?",
+                (ticker,),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {
+            "price_analyst_report": row[0],
+            "news_analyst_report": row[1],
+            "final_report": json.loads(row[2]),
+            "created_at": row[3],
+        }
+
+    def load_fresh(self, ticker: str, max_age: float = REPORT_MAX_AGE):
+        """Returns the stored reports of a ticker, or None if missing or older than `max_age`."""
+        reports = self.load(ticker)
+        if reports is None or time.time() - reports["created_at"] > max_age:
+            return None
+        return reports
+
+
+class ReportScheduler:
+    """Periodically rebuilds the reports of every ticker with bounded concurrency."""
+
+    def __init__(
+        self,
+        build_reports,
+        store: ReportStore,
+        symbols=None,
+        interval: float = PRECOMPUTE_INTERVAL,
+        max_workers: int = PRECOMPUTE_WORKERS,
+    ):
+        self.build_reports = build_reports
+        self.store = store
+        self.symbols = symbols or [symbol for symbol in top_crypto_dict if symbol != "NoCoin"]
+        self.interval = interval
+        self.max_workers = max_workers
+        self._stop = threading.Event()
+
+    def _build(self, symbol: str) -> bool:
+        try:
+            self.store.save(symbol, self.build_reports(symbol))
+            return True
+        except Exception as e:
+            print(f"Error precomputing reports for {symbol}: {e}")
+            return False
+
+    def run_once(self) -> int:
+        """Builds the reports of all symbols once and returns how many succeeded."""
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            built = sum(executor.map(self._build, self.symbols))
+        print(f"Precomputed reports for {built}/{len(self.symbols)} tickers in {time.time() - start:.1f}s")
+        return built
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute analyst reports for all tickers")
+    parser.add_argument("--once", action="store_true", help="build the reports once and exit")
+    parser.add_argument("--interval", type=int, default=PRECOMPUTE_INTERVAL)
+    parser.add_argument("--workers", type=int, default=PRECOMPUTE_WORKERS)
+    parser.add_argument("symbols", nargs="*", help="tickers to build, all of them by default")
+    args = parser.parse_args()
+
+    from main import build_ticker_reports, report_store
+
+    scheduler = ReportScheduler(
+        build_ticker_reports,
+        report_store,
+        symbols=args.symbols or None,
+        interval=args.interval,
+        max_workers=args.workers,
+    )
+    if args.once:
+        scheduler.run_once()
+    else:
+        scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Threads running speculative fetches, and how many fetches may be queued or running at once
+PREFETCH_WORKERS = int(os.environ.get("PREFETCH_WORKERS", 4))
+PREFETCH_MAX_PENDING = int(os.environ.get("PREFETCH_MAX_PENDING", 16))
+# Speculative results nobody claimed within this many seconds are dropped
+PREFETCH_TTL = int(os.environ.get("PREFETCH_TTL", 60))
+
+
+class Prefetcher:
+    """Starts fetches for data a request will probably need before it's known for sure.
+
+    Fetches are keyed like the data they return, e.g. ("price", "BTC", "WEEKLY"), and
+    shared by the requests speculating on the same key. Every request that called
+    `start` for a key must later either `discard` it, once it knows the data isn't
+    needed, or take its result with `result`. The fetch is only cancelled or dropped
+    once no request uses it any more. Used and wasted counts are kept per request, so
+    they show whether the speculation is worth the extra load.
+    """
+
+    def __init__(self, workers: int = PREFETCH_WORKERS, max_pending: int = PREFETCH_MAX_PENDING, ttl: float = PREFETCH_TTL):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        # key -> [future, start time, number of requests using it]
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.joined = 0
+        self.skipped = 0
+        self.hits = 0
+        self.wasted = 0
+
+    def start(self, fetches: dict) -> list:
+        """Starts the fetches that aren't running already, as long as the pool has room.
+
+        Args:
+            fetches: Callables without arguments, keyed by what they fetch.
+
+        Returns:
+            The keys the request now uses, each to be passed to `discard` or `result` once.
+        """
+        started = []
+        with self._lock:
+            self._expire()
+            for key, fetch in fetches.items():
+                entry = self._futures.get(key)
+                if entry is not None:
+                    entry[2] += 1
+                    self.joined += 1
+                    started.append(key)
+                elif len(self._futures) >= self.max_pending:
+                    self.skipped += 1
+                else:
+                    self._futures[key] = [self._executor.submit(fetch), time.time(), 1]
+                    self.started += 1
+                    started.append(key)
+        return started
+
+    def discard(self, keys):
+        """Releases speculative fetches the request doesn't need after all."""
+        with self._lock:
+            for key in keys:
+                future, unused = self._release(key)
+                if future is not None:
+                    self.wasted += 1
+                if unused:
+                    # A no-op once the fetch started, its result is just dropped
+                    future.cancel()
+
+    def result(self, key, fetch):
+        """Returns the result of the request's speculative fetch of `key`.
+
+        Only called with a key the request got from `start`. If the fetch expired in the
+        meantime, or failed, `fetch()` is called instead, so the caller sees the same
+        errors as without speculation.
+        """
+        with self._lock:
+            future, _ = self._release(key)
+            if future is not None:
+                self.hits += 1
+        if future is not None:
+            try:
+                return future.result()
+            except Exception as e:
+                print(f"Speculative fetch of {key} failed, fetching again: {e}")
+        return fetch()
+
+    def _release(self, key):
+        """Drops one user of the fetch of `key`, and the fetch itself once unused.
+
+        Returns:
+            The future of the fetch, None if it expired, and whether no request uses it any more.
+        """
+        entry = self._futures.get(key)
+        if entry is None:
+            return None, False
+        entry[2] -= 1
+        if entry[2] == 0:
+            del self._futures[key]
+        return entry[0], entry[2] == 0
+
+    def _expire(self):
+        now = time.time()
+        for key in [key for key, entry in self._futures.items() if now - entry[1] > self.ttl]:
+            future, _, users = self._futures.pop(key)
+            future.cancel()
+            self.wasted += users
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire()
+            settled = self.hits + self.wasted
+            return {
+                "started": self.started,
+                "joined": self.joined,
+                "skipped": self.skipped,
+                "pending": len(self._futures),
+                "hits": self.hits,
+                "wasted": self.wasted,
+                "hit_rate": self.hits / settled if settled else None,
+            }
+
+
+prefetcher = Prefetcher()
@@ -0,0 +1,177 @@
+import argparse
+import fcntl
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import price_store
+from bars import BarViews
+from classes import TimeFrame
+from consts import top_crypto_dict
+from price_store import OHLCV_COLUMNS, PRICE_REFRESH_SECONDS
+
+PRICE_ARCHIVE_DIR = os.environ.get(
+    "PRICE_ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "archive"),
+)
+# Archive files the writer hasn't replaced for this long are considered abandoned
+PRICE_ARCHIVE_MAX_AGE = int(os.environ.get("PRICE_ARCHIVE_MAX_AGE", 3 * PRICE_REFRESH_SECONDS))
+
+
+def archive_path(symbol: str, time_frame: TimeFrame) -> str:
+    return os.path.join(PRICE_ARCHIVE_DIR, f"{symbol}.{time_frame.name.lower()}.npy")
+
+
+def write(symbol: str, time_frame: TimeFrame, df: pd.DataFrame):
+    """Replaces the archive file of a ticker and timeframe.
+
+    The file is a (1 + len(OHLCV_COLUMNS), bars) float64 array, so every column is
+    contiguous on disk. The first row holds the int64 nanosecond timestamps of the
+    bars, stored bit for bit so that readers can view them as datetime64 without a
+    copy. The array is written to a temporary file and renamed over the old one,
+    readers see either the previous or the new complete history.
+
+    Args:
+        symbol: Ticker symbol.
+        time_frame: Timeframe of the bars.
+        df: Bars indexed by date with OHLCV columns.
+    """
+    values = np.empty((1 + len(OHLCV_COLUMNS), len(df)))
+    values[0] = df.index.to_numpy(dtype="datetime64[ns]").view(np.int64).view(np.float64)
+    values[1:] = df[OHLCV_COLUMNS].to_numpy(dtype=float).T
+    path = archive_path(symbol, time_frame)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, values)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ArchiveReader:
+    """Per-process view of the archive files, memory-mapped read-only.
+
+    The pages of a file are shared by all processes mapping it, so workers don't hold
+    private copies of the history. A file is mapped again once the writer replaced it.
+    """
+
+    def __init__(self, max_age: float = PRICE_ARCHIVE_MAX_AGE):
+        self.max_age = max_age
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def read(self, symbol: str, time_frame: TimeFrame):
+        """Returns the archived bars of a ticker and timeframe.
+
+        Args:
+            symbol: Ticker symbol.
+            time_frame: Timeframe of the bars.
+
+        Returns:
+            A DataFrame with OHLCV columns indexed by date, backed by the mapped file,
+            or None if there is no archive file or the writer stopped updating it.
+        """
+        path = archive_path(symbol, time_frame)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if time.time() - stat.st_mtime > self.max_age:
+            return None
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        key = (symbol, time_frame)
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is None or entry[0] != version:
+                entry = (version, self._map(path))
+                self._frames[key] = entry
+        return entry[1]
+
+    @staticmethod
+    def _map(path: str) -> pd.DataFrame:
+        values = np.load(path, mmap_mode="r")
+        dates = pd.DatetimeIndex(values[0].view("datetime64[ns]"), name="date", copy=False)
+        # The transposed view keeps the OHLCV rows as one block over the mapped pages
+        return pd.DataFrame(values[1:].T, index=dates, columns=OHLCV_COLUMNS, copy=False)
+
+
+class ArchiveWriter:
+    """Keeps the daily, weekly and monthly archive files up to date from the price store.
+
+    Run a single one per host.
+    """
+
+    def __init__(self, symbols=None, interval: float = PRICE_REFRESH_SECONDS):
+        self.symbols = symbols or [symbol for symbol in top_crypto_dict if symbol != "NoCoin"]
+        self.interval = interval
+        self.views = BarViews()
+        self._lock_file = None
+
+    def acquire(self) -> bool:
+        """Takes the writer lock of the archive directory, False if another writer holds it."""
+        os.makedirs(PRICE_ARCHIVE_DIR, exist_ok=True)
+        self._lock_file = open(os.path.join(PRICE_ARCHIVE_DIR, ".writer.lock"), "w")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+
+    def _update(self, symbol: str) -> bool:
+        try:
+            added = price_store.refresh(symbol)
+            paths = [archive_path(symbol, time_frame) for time_frame in TimeFrame]
+            if added or not all(os.path.exists(path) for path in paths):
+                daily = price_store.load(symbol)
+                for time_frame in TimeFrame:
+                    # Weekly and monthly bars only aggregate the days since the last period
+                    write(symbol, time_frame, self.views.get(symbol, time_frame, daily))
+            else:
+                # Nothing new, but readers must still see that the writer is alive
+                for path in paths:
+                    os.utime(path)
+            return True
+        except Exception as e:
+            print(f"Error archiving price data for {symbol}: {e}")
+            return False
+
+    def run_once(self) -> int:
+        start = time.time()
+        updated = sum(self._update(symbol) for symbol in self.symbols)
+        print(f"Archived prices of {updated}/{len(self.symbols)} tickers in {time.time() - start:.1f}s")
+        return updated
+
+    def run_forever(self):
+        while True:
+            self.run_once()
+            time.sleep(self.interval)
+
+
+archive_reader = ArchiveReader()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the memory-mapped price archive read by the API workers")
+    parser.add_argument("--once", action="store_true", help="update the archive once and exit")
+    parser.add_argument("--interval", type=int, default=PRICE_REFRESH_SECONDS)
+    parser.add_argument("symbols", nargs="*", help="tickers to archive, all of them by default")
+    args = parser.parse_args()
+
+    writer = ArchiveWriter(symbols=args.symbols or None, interval=args.interval)
+    if not writer.acquire():
+        print(f"Another price archive writer is running on {PRICE_ARCHIVE_DIR}")
+        return
+    if args.once:
+        writer.run_once()
+    else:
+        writer.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import os
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+import openbb as obb
+
+from circuit_breaker import OPENBB_TIMEOUT, CircuitBreaker, openbb_breaker
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+# Providers asked for price history, in order: "openbb" is OpenBB's default source,
+# "openbb:<name>" another OpenBB provider and "csv" the files in PRICE_FALLBACK_DIR
+PRICE_PROVIDERS = os.environ.get("PRICE_PROVIDERS", "openbb,openbb:yfinance")
+# Seconds without an answer after which the next provider is asked as well
+PRICE_HEDGE_DELAY = float(os.environ.get("PRICE_HEDGE_DELAY", 2))
+# Provider requests in flight at once, including the hedges still running in the background
+PRICE_PROVIDER_WORKERS = int(os.environ.get("PRICE_PROVIDER_WORKERS", 32))
+PRICE_FALLBACK_DIR = os.environ.get(
+    "PRICE_FALLBACK_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fallback_prices"),
+)
+
+
+def normalize_bars(df: pd.DataFrame) -> pd.DataFrame:
+    """Brings the bars of any provider into the price store's schema.
+
+    Args:
+        df: Bars with OHLCV columns and either a "date" column or a date index.
+
+    Returns:
+        A DataFrame with a naive "date" column and float OHLCV columns, one row per
+        day, oldest first.
+    """
+    if "date" not in df.columns:
+        df = df.rename_axis("date").reset_index()
+    missing = [column for column in OHLCV_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"bars are missing the {', '.join(missing)} columns")
+    dates = pd.to_datetime(df["date"], utc=True).dt.tz_localize(None).dt.normalize()
+    bars = df[OHLCV_COLUMNS].astype(float).assign(date=dates.to_numpy())
+    bars = bars.dropna(subset=["close"]).drop_duplicates(subset="date", keep="last")
+    return bars.sort_values("date")[["date"] + OHLCV_COLUMNS].reset_index(drop=True)
+
+
+class OpenBBProvider:
+    """Crypto price history from OpenBB, through the breaker of the OpenBB provider used."""
+
+    def __init__(self, provider: str = None, breaker: CircuitBreaker = None):
+        self.provider = provider
+        self.name = f"openbb:{provider}" if provider else "openbb"
+        self.breaker = breaker or CircuitBreaker(self.name, timeout=OPENBB_TIMEOUT)
+
+    def fetch(self, symbol: str, start_date: str) -> pd.DataFrame:
+        kwargs = {"provider": self.provider} if self.provider else {}
+        return self.breaker.call(
+            lambda: obb.obb.crypto.price.historical(symbol=f"{symbol}USD", start_date=start_date, **kwargs),
+            key=f"price:{symbol}",
+        )
+
+
+class CsvProvider:
+    """Local stand-in for the remote providers, reading `<symbol>.csv` files with a date and OHLCV columns."""
+
+    name = "csv"
+
+    def __init__(self, directory: str = PRICE_FALLBACK_DIR):
+        self.directory = directory
+
+    def fetch(self, symbol: str, start_date: str) -> pd.DataFrame:
+        df = pd.read_csv(os.path.join(self.directory, f"{symbol}.csv"), parse_dates=["date"])
+        return df[df["date"] >= pd.Timestamp(start_date)]
+
+
+class PriceProviderChain:
+    """Fetches price history from an ordered chain of providers, first valid answer wins.
+
+    The first provider is asked right away. Whenever the pending providers stay silent
+    for `hedge_delay` seconds, or one of them fails, the next provider in the chain is
+    asked too. The first non-empty result is returned, normalised by normalize_bars;
+    the slower requests are left to finish in the background and their results dropped.
+    """
+
+    def __init__(self, providers: list, hedge_delay: float = PRICE_HEDGE_DELAY, workers: int = PRICE_PROVIDER_WORKERS):
+        if not providers:
+            raise ValueError("a price provider chain needs at least one provider")
+        self.providers = providers
+        self.hedge_delay = hedge_delay
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="price-provider")
+        self._lock = threading.Lock()
+        self.wins = Counter()
+        self.failures = Counter()
+        self.hedges = 0
+
+    def fetch(self, symbol: str, start_date: str) -> pd.DataFrame:
+        """Returns the daily bars of a ticker since `start_date` from the fastest provider.
+
+        Args:
+            symbol: Ticker symbol, e.g. "BTC".
+            start_date: First date to fetch, as "YYYY-MM-DD".
+
+        Returns:
+            A DataFrame with a "date" column and OHLCV columns.
+
+        Raises:
+            ValueError: No provider returned any bars.
+        """
+        remaining = list(self.providers)
+        pending = {}
+        errors = []
+
+        def ask_next():
+            provider = remaining.pop(0)
+            pending[self._executor.submit(self._fetch, provider, symbol, start_date)] = provider
+
+        ask_next()
+        while pending:
+            done, _ = wait(pending, timeout=self.hedge_delay if remaining else None, return_when=FIRST_COMPLETED)
+            if not done:
+                # Hedge against a slow provider, whichever answers first is used
+                with self._lock:
+                    self.hedges += 1
+                ask_next()
+                continue
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    bars = future.result()
+                except Exception as e:
+                    errors.append(f"{provider.name}: {e}")
+                    with self._lock:
+                        self.failures[provider.name] += 1
+                    if remaining:
+                        ask_next()
+                    continue
+                with self._lock:
+                    self.wins[provider.name] += 1
+                return bars
+        raise ValueError(f"no price provider returned bars for {symbol} ({'; '.join(errors)})")
+
+    @staticmethod
+    def _fetch(provider, symbol: str, start_date: str) -> pd.DataFrame:
+        bars = normalize_bars(provider.fetch(symbol, start_date))
+        if bars.empty:
+            raise ValueError("no bars returned")
+        return bars
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "providers": [provider.name for provider in self.providers],
+                "hedge_delay": self.hedge_delay,
+                "hedges": self.hedges,
+                "wins": dict(self.wins),
+                "failures": dict(self.failures),
+            }
+
+
+def build_chain(spec: str = PRICE_PROVIDERS, hedge_delay: float = PRICE_HEDGE_DELAY) -> PriceProviderChain:
+    """Creates the provider chain described by a comma-separated PRICE_PROVIDERS string."""
+    providers = []
+    for name in filter(None, (name.strip() for name in spec.split(","))):
+        if name == "openbb":
+            providers.append(OpenBBProvider(breaker=openbb_breaker))
+        elif name.startswith("openbb:"):
+            providers.append(OpenBBProvider(name.split(":", 1)[1]))
+        elif name == "csv":
+            providers.append(CsvProvider())
+        else:
+            raise ValueError(f"unknown price provider {name}")
+    if not providers:
+        raise ValueError("PRICE_PROVIDERS must name at least one price provider")
+    return PriceProviderChain(providers, hedge_delay=hedge_delay)
+
+
+price_chain = build_chain()
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import pandas as pd
+
+from price_providers import OHLCV_COLUMNS, price_chain
+
+PRICE_STORE_PATH = os.environ.get(
+    "PRICE_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "prices.sqlite"),
+)
+# Minimum number of seconds between two provider refreshes of the same ticker
+PRICE_REFRESH_SECONDS = int(os.environ.get("PRICE_REFRESH_SECONDS", 3600))
+HISTORY_START_DATE = "2010-01-01"
+
+_locks = defaultdict(threading.Lock)
+
+
+@contextmanager
+def _connect():
+    os.makedirs(os.path.dirname(PRICE_STORE_PATH), exist_ok=True)
+    conn = sqlite3.connect(PRICE_STORE_PATH, timeout=30)
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS daily_bars (
+            ticker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            open REAL, high REAL, low REAL, close REAL, volume REAL,
+            PRIMARY KEY (ticker, date)
+        )"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS refreshes (
+            ticker TEXT PRIMARY KEY,
+            refreshed_at REAL NOT NULL
+        )"""
+    )
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _last_stored_date(conn: sqlite3.Connection, symbol: str):
+    row = conn.execute(
+        "SELECT MAX(date) FROM daily_bars WHERE ticker = ?", (symbol,)
+    ).fetchone()
+    return pd.Timestamp(row[0]) if row and row[0] else None
+
+
+def _needs_refresh(conn: sqlite3.Connection, symbol: str) -> bool:
+    row = conn.execute(
+        "SELECT refreshed_at FROM refreshes WHERE ticker = ?", (symbol,)
+    ).fetchone()
+    return row is None or time.time() - row[0] >= PRICE_REFRESH_SECONDS
+
+
+def _store_bars(conn: sqlite3.Connection, symbol: str, df: pd.DataFrame):
+    rows = [
+        (symbol, date.strftime("%Y-%m-%d"), *values)
+        for date, values in zip(
+            df["date"], df[OHLCV_COLUMNS].itertuples(index=False, name=None)
+        )
+    ]
+    # The last stored bar can still be the (incomplete) current day, so replace it
+    conn.executemany(
+        "INSERT OR REPLACE INTO daily_bars VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+    )
+
+
+def refresh(symbol: str, force: bool = False) -> int:
+    """Fetches the bars missing from the store for the given ticker symbol.
+
+    Only the bars starting at the last stored date are requested from the provider,
+    the full history is downloaded just once.
+
+    Args:
+        symbol: Ticker symbol, e.g. "BTC".
+        force: Refresh even if the ticker was refreshed less than PRICE_REFRESH_SECONDS ago.
+
+    Returns:
+        The number of bars written to the store.
+    """
+    with _locks[symbol]:
+        with _connect() as conn:
+            if not force and not _needs_refresh(conn, symbol):
+                return 0
+            last_date = _last_stored_date(conn, symbol)
+        start_date = (
+            last_date.strftime("%Y-%m-%d") if last_date is not None else HISTORY_START_DATE
+        )
+        # The store answers first, the providers are only asked for the missing bars
+        df = price_chain.fetch(symbol, start_date)
+        with _connect() as conn:
+            _store_bars(conn, symbol, df)
+            conn.execute(
+                "INSERT OR REPLACE INTO refreshes VALUES (?, ?)", (symbol, time.time())
+            )
+        return len(df)
+
+
+def load(symbol: str) -> pd.DataFrame:
+    """Reads the stored daily bars of the given ticker symbol.
+
+    Args:
+        symbol: Ticker symbol, e.g. "BTC".
+
+    Returns:
+        A DataFrame with OHLCV columns indexed by date, empty if nothing is stored.
+    """
+    with _connect() as conn:
+        df = pd.read_sql_query(
+            "SELECT date, open, high, low, close, volume FROM daily_bars "
+            "WHERE ticker = ? ORDER BY date",
+            conn,
+            params=(symbol,),
+            parse_dates=["date"],
+        )
+    return df.set_index("date")
+
+
+def get_daily_bars(symbol: str) -> pd.DataFrame:
+    """Returns the full daily history of a ticker, topped up from the provider.
+
+    If the provider can't be reached, or its circuit breaker is open, the stored
+    history is served as is.
+
+    Args:
+        symbol: Ticker symbol, e.g. "BTC".
+
+    Returns:
+        A DataFrame with OHLCV columns indexed by date.
+    """
+    try:
+        refresh(symbol)
+    except Exception as e:
+        print(f"Error refreshing price data for {symbol}, serving stored bars: {e}")
+    return load(symbol)
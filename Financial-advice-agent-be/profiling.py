@@ -0,0 +1,39 @@
+import os
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# tracemalloc slows every allocation down, so only measure while sizing workers
+MEASURE_MEMORY = os.environ.get("MEASURE_MEMORY") == "1"
+
+
+@contextmanager
+def measure_memory(label: str):
+    """Prints the peak Python allocations of the block and the peak RSS of the process.
+
+    The traced peak is process-wide, so measure with a single worker thread handling
+    one request at a time to get per-request numbers.
+
+    Args:
+        label: Name of the measured block in the printed line.
+    """
+    if not MEASURE_MEMORY:
+        yield
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        # ru_maxrss is in KiB on Linux
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(
+            f"{label} memory: peak {(peak - baseline) / 2**20:.1f} MiB allocated, "
+            f"{(current - baseline) / 2**20:.1f} MiB retained, process max RSS {max_rss:.0f} MiB "
+            f"({time.perf_counter() - start:.2f}s)"
+        )
@@ -0,0 +1,110 @@
+import math
+
+import pandas as pd
+
+# Rough size of a token for English text and numbers, avoids depending on a tokenizer
+CHARS_PER_TOKEN = 4
+PRICE_PROMPT_COLUMNS = [
+    "close",
+    "volume",
+    "ma_50",
+    "ma_200",
+    "rsi",
+    "macd",
+    "macd_signal",
+    "macd_histogram",
+    "bb_lower",
+    "bb_middle",
+    "bb_upper",
+]
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def format_number(value) -> str:
+    """Formats a number with just the precision an analyst needs."""
+    if value is None or pd.isna(value):
+        return ""
+    value = float(value)
+    magnitude = abs(value)
+    if magnitude >= 1e9:
+        return f"{value / 1e9:.2f}B"
+    if magnitude >= 1e6:
+        return f"{value / 1e6:.2f}M"
+    if magnitude >= 1000:
+        return f"{value:.0f}"
+    if magnitude >= 1:
+        return f"{value:.2f}"
+    return f"{value:.4g}"
+
+
+def format_table(df: pd.DataFrame, columns: list) -> str:
+    """Serialises a date-indexed frame as compact CSV, oldest row first."""
+    columns = [column for column in columns if column in df.columns]
+    lines = [",".join(["date"] + columns)]
+    values = df[columns].to_numpy()
+    for date, row in zip(df.index, values):
+        lines.append(",".join([pd.Timestamp(date).strftime("%Y-%m-%d")] + [format_number(v) for v in row]))
+    return "\n".join(lines)
+
+
+def fit_table(df: pd.DataFrame, columns: list, token_budget: int) -> str:
+    """Serialises the most recent rows of `df` that fit in `token_budget` tokens.
+
+    Args:
+        df: Date-indexed frame.
+        columns: Columns to include, in order.
+        token_budget: Maximum number of tokens of the table.
+
+    Returns:
+        The CSV table, dropping the oldest rows first when over budget.
+    """
+    rows = len(df)
+    table = format_table(df, columns)
+    while rows > 1 and estimate_tokens(table) > token_budget:
+        # Shrink proportionally to the overshoot instead of one row at a time
+        rows = min(rows - 1, int(rows * token_budget / estimate_tokens(table)))
+        table = format_table(df.tail(max(rows, 1)), columns)
+    return table
+
+
+def money_supply_summary(money_supply_df: pd.DataFrame) -> str:
+    """Summarises the monthly M2 series as a few derived figures instead of raw levels."""
+    m2 = money_supply_df["m2"].dropna() if "m2" in money_supply_df else pd.Series(dtype=float)
+    if len(m2) < 13:
+        return "Data not available"
+    latest = m2.iloc[-1]
+    yoy = latest / m2.iloc[-13] - 1
+    three_months = (latest / m2.iloc[-4]) ** 4 - 1
+    previous_yoy = m2.iloc[-2] / m2.iloc[-14] - 1 if len(m2) >= 14 else yoy
+    direction = "accelerating" if yoy > previous_yoy else "decelerating"
+    return (
+        f"latest ({pd.Timestamp(m2.index[-1]).strftime('%Y-%m')}): {format_number(latest)}\n"
+        f"year-over-year change: {yoy:+.1%} ({direction})\n"
+        f"3-month annualised change: {three_months:+.1%}\n"
+        f"5-year range: {format_number(m2.iloc[-60:].min())} - {format_number(m2.iloc[-60:].max())}"
+    )
+
+
+class PromptSections:
+    """Collects named prompt sections and reports the token estimate of each."""
+
+    def __init__(self):
+        self.sections = {}
+
+    def add(self, name: str, text: str) -> str:
+        self.sections[name] = text
+        return text
+
+    def prompt(self) -> str:
+        return "".join(self.sections.values())
+
+    def token_counts(self) -> dict:
+        return {name: estimate_tokens(text) for name, text in self.sections.items()}
+
+    def report(self, prompt_name: str):
+        counts = self.token_counts()
+        details = ", ".join(f"{name}={tokens}" for name, tokens in counts.items())
+        print(f"{prompt_name} prompt tokens ~{sum(counts.values())}: {details}")
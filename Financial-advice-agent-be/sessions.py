@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+SESSION_TTL = int(os.environ.get("SESSION_TTL", 30 * 60))
+SESSION_MAX_ENTRIES = int(os.environ.get("SESSION_MAX_ENTRIES", 1000))
+SESSION_MAX_BYTES = int(os.environ.get("SESSION_MAX_BYTES", 32 * 1024 * 1024))
+# Question and answer pairs kept as conversation context for follow-ups
+SESSION_HISTORY_TURNS = int(os.environ.get("SESSION_HISTORY_TURNS", 5))
+
+
+class SessionStore:
+    """In-process LRU store of conversation sessions, bounded by count, age and size.
+
+    Sessions are JSON-serialisable dictionaries; their serialised length is used as
+    their size, and the least recently used sessions are evicted once the total
+    goes over `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        ttl: float = SESSION_TTL,
+        max_entries: int = SESSION_MAX_ENTRIES,
+        max_bytes: int = SESSION_MAX_BYTES,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_id: str):
+        """Returns a copy of the session, or None if it doesn't exist or expired."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry[1] < time.time():
+                if entry is not None:
+                    self._remove(session_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return json.loads(entry[0])
+
+    def set(self, session_id: str, session: dict):
+        value = json.dumps(session)
+        with self._lock:
+            if session_id in self._entries:
+                self._remove(session_id)
+            self._entries[session_id] = (value, time.time() + self.ttl)
+            self._bytes += len(value)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, session_id: str):
+        value, _ = self._entries.pop(session_id)
+        self._bytes -= len(value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"sessions": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+def add_turn(session: dict, user_query: str, answer: str) -> dict:
+    """Appends a question and its answer to the session history, keeping the last turns."""
+    history = session.get("history", []) + [[user_query, answer]]
+    session["history"] = history[-SESSION_HISTORY_TURNS:]
+    return session
+
+
+session_store = SessionStore()
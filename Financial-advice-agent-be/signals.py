@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+
+from utils import calculate_50_percent
+
+FIFTY_PERCENT_WEEKS = (4, 12, 26)
+FORECAST_WEEKS = (1, 2, 3, 4)
+# Two-sided 90% band of a normal distribution
+FORECAST_Z = 1.645
+# Weight of the recent drift in the forecast, the rest of the expected return is zero
+DRIFT_WEIGHT = 0.5
+# Weights of the score components, renormalised over the ones available
+RSI_WEIGHT = 0.4
+BOLLINGER_WEIGHT = 0.2
+FIFTY_PERCENT_WEIGHT = 0.4
+BUY_MIN_SCORE = 60
+SELL_MAX_SCORE = 40
+GREED_MIN_SENTIMENT = 60
+FEAR_MAX_SENTIMENT = 40
+
+
+def _is_set(*values) -> bool:
+    return all(value is not None and not pd.isna(value) for value in values)
+
+
+def trend(price_df: pd.DataFrame) -> str:
+    """Derives the trend from the MA50/MA200 cross, price vs MA50 and the MACD histogram.
+
+    Each of the three checks votes up or down; two votes in the same direction
+    decide the trend.
+    """
+    last = price_df.iloc[-1]
+    votes = 0
+    for fast, slow in ((last.ma_50, last.ma_200), (last.close, last.ma_50), (last.macd_histogram, 0.0)):
+        if _is_set(fast, slow):
+            votes += 1 if fast > slow else -1 if fast < slow else 0
+    if votes >= 2:
+        return "UP"
+    if votes <= -2:
+        return "DOWN"
+    return "NEUTRAL"
+
+
+def score(price_df: pd.DataFrame) -> int:
+    """Bullishness between 0 and 100 from RSI, the Bollinger position and the 50% levels.
+
+    The 50% level components measure where the close sits in the high-low range of the
+    last 4, 12 and 26 weeks.
+    """
+    last = price_df.iloc[-1]
+    components, weights = [], []
+    if _is_set(last.rsi):
+        components.append(last.rsi)
+        weights.append(RSI_WEIGHT)
+    if _is_set(last.bb_lower, last.bb_upper) and last.bb_upper > last.bb_lower:
+        position = (last.close - last.bb_lower) / (last.bb_upper - last.bb_lower)
+        components.append(100 * min(max(position, 0.0), 1.0))
+        weights.append(BOLLINGER_WEIGHT)
+    for weeks in FIFTY_PERCENT_WEEKS:
+        _, low, high = calculate_50_percent(price_df, n_weeks=weeks)
+        if _is_set(low, high) and high > low:
+            components.append(100 * (last.close - low) / (high - low))
+            weights.append(FIFTY_PERCENT_WEIGHT / len(FIFTY_PERCENT_WEEKS))
+    if not components:
+        return 50
+    return int(round(np.average(components, weights=weights)))
+
+
+def forecast_band(price_df: pd.DataFrame, weeks=FORECAST_WEEKS) -> pd.DataFrame:
+    """Lognormal 1-4 week forecast band from the drift and volatility of weekly returns.
+
+    Returns:
+        A DataFrame indexed by weeks ahead with "low", "mid" and "high" prices.
+    """
+    closes = price_df["close"].dropna()
+    returns = np.diff(np.log(closes.to_numpy()))
+    last = float(closes.iloc[-1])
+    if len(returns) < 2:
+        return pd.DataFrame({"low": last, "mid": last, "high": last}, index=pd.Index(weeks, name="weeks"))
+    drift = DRIFT_WEIGHT * returns.mean()
+    volatility = returns.std(ddof=1)
+    horizon = np.array(weeks, dtype=float)
+    mid = last * np.exp(drift * horizon)
+    spread = FORECAST_Z * volatility * np.sqrt(horizon)
+    return pd.DataFrame(
+        {"low": mid * np.exp(-spread), "mid": mid, "high": mid * np.exp(spread)},
+        index=pd.Index(weeks, name="weeks"),
+    )
+
+
+def action(trend_value: str, score_value: int) -> str:
+    if trend_value == "UP" and score_value >= BUY_MIN_SCORE:
+        return "BUY"
+    if trend_value == "DOWN" and score_value <= SELL_MAX_SCORE:
+        return "SELL"
+    return "HODL"
+
+
+def sentiment_bucket(value: int) -> str:
+    """Maps a 0-100 sentiment number to the FinalReport sentiment."""
+    if value >= GREED_MIN_SENTIMENT:
+        return "GREED"
+    if value <= FEAR_MAX_SENTIMENT:
+        return "FEAR"
+    return "NEUTRAL"
+
+
+def sentiment_from_score(value) -> str:
+    """Buckets the news analyst's 0-100 sentiment, NEUTRAL when there is none."""
+    return "NEUTRAL" if value is None else sentiment_bucket(value)
+
+
+def price_signals(price_df: pd.DataFrame) -> dict:
+    """Computes the numeric FinalReport fields from the price and indicator frame.
+
+    Args:
+        price_df: Bars with the add_indicators columns, oldest first; weeks here mean bars of any timeframe.
+
+    Returns:
+        A dictionary with "trend", "score", "action", "price_predictions" and the
+        "forecast_band" DataFrame.
+    """
+    trend_value = trend(price_df)
+    score_value = score(price_df)
+    band = forecast_band(price_df)
+    return {
+        "trend": trend_value,
+        "score": score_value,
+        "action": action(trend_value, score_value),
+        "price_predictions": [float(f"{price:.6g}") for price in band["mid"]],
+        "forecast_band": band,
+    }
+
+
+def signal_summary(signals: dict, sentiment: str, period: str = "week") -> str:
+    band = signals["forecast_band"]
+    low, high = band["low"].iloc[-1], band["high"].iloc[-1]
+    return (
+        f"The price trend is {signals['trend']} with a bullishness score of {signals['score']}/100 "
+        f"and {sentiment} news sentiment. "
+        f"The 4-{period} 90% forecast band is {low:,.6g} to {high:,.6g}."
+    )
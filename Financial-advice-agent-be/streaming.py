@@ -0,0 +1,118 @@
+import json
+import re
+import string
+
+ADVICE_KEY_PATTERN = re.compile(r'"advice"\s*:\s*"')
+JSON_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+def sse_event(event: str, data) -> str:
+    """Formats a server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def parse_hex(digits: str):
+    """Returns the value of four hex digits, or None if they aren't any."""
+    if len(digits) != 4 or any(char not in string.hexdigits for char in digits):
+        return None
+    return int(digits, 16)
+
+
+class AdviceStreamParser:
+    """Incrementally extracts the text of a streamed {"advice": "..."} reply.
+
+    Chunks are fed as the LLM produces them and only the decoded advice text is
+    returned, so clients never see the JSON wrapper or escape sequences. Replies that
+    don't start with a JSON object are passed through unchanged.
+    """
+
+    def __init__(self):
+        self._state = "start"
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> str:
+        """Consumes a chunk of the reply.
+
+        Args:
+            chunk: The next piece of the LLM output.
+
+        Returns:
+            The advice text decoded from this chunk, possibly empty.
+        """
+        self._buffer += chunk
+        text = ""
+        if self._state == "start":
+            self._buffer = self._buffer.lstrip()
+            if not self._buffer:
+                return text
+            self._state = "key" if self._buffer[0] == "{" else "raw"
+        if self._state == "raw":
+            text, self._buffer = self._buffer, ""
+        if self._state == "key":
+            match = ADVICE_KEY_PATTERN.search(self._buffer)
+            if match:
+                self._buffer = self._buffer[match.end() :]
+                self._state = "value"
+        if self._state == "value":
+            text = self._decode_value()
+        if self._state == "done":
+            self._buffer = ""
+        return text
+
+    def close(self) -> str:
+        """Returns whatever could not be parsed as an advice value once the stream ends."""
+        rest = self._buffer if self._state in ("start", "key") else ""
+        self._buffer = ""
+        self._state = "done"
+        return rest
+
+    def _decode_value(self) -> str:
+        buffer = self._buffer
+        text = []
+        i = 0
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self._state = "done"
+                i += 1
+                break
+            if char != "\\":
+                text.append(char)
+                i += 1
+                continue
+            # Escape sequences may be split across chunks, keep them for the next one
+            if i + 1 >= len(buffer):
+                break
+            if buffer[i + 1] != "u":
+                text.append(JSON_ESCAPES.get(buffer[i + 1], buffer[i + 1]))
+                i += 2
+                continue
+            if i + 6 > len(buffer):
+                break
+            code = parse_hex(buffer[i + 2 : i + 6])
+            if code is None:
+                # Not a valid escape, pass it through as it is
+                text.append(buffer[i : i + 2])
+                i += 2
+                continue
+            if 0xD800 <= code < 0xDC00:
+                # Wait for the low surrogate unless what follows can't be one
+                if i + 12 > len(buffer) and "\\u".startswith(buffer[i + 6 : i + 8]):
+                    break
+                low = parse_hex(buffer[i + 8 : i + 12]) if buffer[i + 6 : i + 8] == "\\u" else None
+                if low is not None and 0xDC00 <= low < 0xE000:
+                    code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                    i += 6
+            text.append(chr(code))
+            i += 6
+        self._buffer = buffer[i:]
+        return "".join(text)
@@ -0,0 +1,186 @@
+import re
+from typing import List, NamedTuple
+
+from consts import top_crypto_dict, crypto_aliases
+
+# Symbols and names that are also plain English words. They only count when written
+# in capitals (e.g. "LINK", "Optimism"), otherwise "market optimism" would mean OP.
+AMBIGUOUS_TERMS = {
+    "algo", "apt", "arb", "atom", "cosmos", "cro", "dai", "dot", "etc", "fet", "fil",
+    "graph", "immutable", "kas", "leo", "link", "mantle", "mantra", "near", "om", "op",
+    "optimism", "pol", "quant", "render", "stacks", "stellar", "sui", "theta", "ton",
+    "uni", "vet",
+}
+# Aliases that refer to a coin without naming it: units and people. They only count
+# when no coin is named directly, "ETH price in sats" asks about ETH alone.
+INDIRECT_TERMS = {"sats", "satoshi", "satoshis", "vitalik"}
+# Words that never name a coin, skipped by the fuzzy matcher
+STOPWORDS = {
+    "about", "above", "after", "again", "analysis", "below", "buying", "coins", "could",
+    "crypto", "forecast", "market", "price", "prices", "right", "selling", "should",
+    "think", "today", "token", "tokens", "trend", "value", "week", "weeks", "what",
+    "where", "which", "would",
+}
+FUZZY_MIN_LENGTH = 5
+FUZZY_MIN_SIMILARITY = 0.45
+NO_COIN = "NoCoin"
+
+
+class Resolution(NamedTuple):
+    symbol: str
+    confidence: float
+    method: str
+
+
+def normalize(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def trigrams(term: str) -> set:
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TickerResolver:
+    """Resolves the coin mentioned in a query without calling the LLM.
+
+    Symbols, names and aliases are indexed once in an exact-match hash keyed by their
+    normalised form. Terms that don't match exactly are compared against the index
+    through character trigrams, which catches most misspellings ("etherium", "solan").
+    Every resolution carries a confidence between 0 and 1, so callers can fall back to
+    the LLM when the resolver isn't sure.
+    """
+
+    def __init__(self, coins: dict = top_crypto_dict, aliases: dict = crypto_aliases):
+        self.exact = {}
+        self.symbols = {symbol for symbol in coins if symbol != NO_COIN}
+        for symbol in self.symbols:
+            terms = [symbol, coins[symbol]] + aliases.get(symbol, [])
+            for term in terms:
+                self.exact.setdefault(normalize(term), symbol)
+        self.max_words = max(len(term.split()) for term in self.exact)
+        self.trigram_index = {}
+        for term in self.exact:
+            if (
+                len(term) >= FUZZY_MIN_LENGTH
+                and " " not in term
+                and term not in AMBIGUOUS_TERMS
+                and term not in INDIRECT_TERMS
+            ):
+                for gram in trigrams(term):
+                    self.trigram_index.setdefault(gram, set()).add(term)
+
+    def resolve_all(self, query: str) -> List[Resolution]:
+        """Returns every coin mentioned in the query, in order of appearance.
+
+        Args:
+            query: The raw user query.
+
+        Returns:
+            A list of resolutions, at most one per symbol.
+        """
+        words = re.findall(r"[A-Za-z0-9]+", query)
+        matches = []
+        covered = set()
+        for n in range(self.max_words, 0, -1):
+            for start in range(len(words) - n + 1):
+                span = range(start, start + n)
+                if covered.intersection(span):
+                    continue
+                original = " ".join(words[start : start + n])
+                match = self._match_exact(original, at_start=start == 0)
+                if match is not None:
+                    matches.append((start, match))
+                    covered.update(span)
+        for start, word in enumerate(words):
+            if start not in covered:
+                match = self._match_fuzzy(word.lower())
+                if match is not None:
+                    matches.append((start, match))
+
+        if any(match.method != "indirect" for _, match in matches):
+            matches = [(start, match) for start, match in matches if match.method != "indirect"]
+        resolutions = {}
+        for _, match in sorted(matches, key=lambda item: item[0]):
+            current = resolutions.get(match.symbol)
+            if current is None or match.confidence > current.confidence:
+                resolutions[match.symbol] = match
+        return list(resolutions.values())
+
+    def resolve(self, query: str) -> Resolution:
+        """Returns the single coin the query is about.
+
+        Queries mentioning several coins or none at all get a low confidence, meaning
+        the resolver can't decide on its own.
+
+        Args:
+            query: The raw user query.
+
+        Returns:
+            The best resolution, with symbol NoCoin if no coin was found.
+        """
+        resolutions = self.resolve_all(query)
+        if not resolutions:
+            return Resolution(NO_COIN, 0.5, "none")
+        best = max(resolutions, key=lambda resolution: resolution.confidence)
+        if len(resolutions) > 1:
+            return Resolution(best.symbol, min(best.confidence, 0.5), "ambiguous")
+        return best
+
+    def possible_mentions(self, query: str) -> set:
+        """Symbols of the ambiguous words in the query, which resolve_all skips in lowercase.
+
+        Args:
+            query: The raw user query.
+
+        Returns:
+            The symbols "link", "ton", "near" etc. could refer to.
+        """
+        return {
+            self.exact[word]
+            for word in normalize(query).split()
+            if word in AMBIGUOUS_TERMS and word in self.exact
+        }
+
+    def _match_exact(self, original: str, at_start: bool):
+        term = normalize(original)
+        symbol = self.exact.get(term)
+        if symbol is None:
+            return None
+        if original == symbol:
+            return Resolution(symbol, 1.0, "symbol")
+        if term in INDIRECT_TERMS:
+            return Resolution(symbol, 1.0, "indirect")
+        if term not in AMBIGUOUS_TERMS:
+            return Resolution(symbol, 1.0, "exact")
+        if original[0].isupper():
+            # A capitalised first word may just be the start of the sentence
+            return Resolution(symbol, 0.6 if at_start else 0.9, "exact")
+        return None
+
+    def _match_fuzzy(self, word: str):
+        if len(word) < FUZZY_MIN_LENGTH or word in STOPWORDS or word in AMBIGUOUS_TERMS:
+            return None
+        grams = trigrams(word)
+        candidates = set()
+        for gram in grams:
+            candidates.update(self.trigram_index.get(gram, ()))
+        scores = {}
+        for term in candidates:
+            term_grams = trigrams(term)
+            similarity = len(grams & term_grams) / len(grams | term_grams)
+            symbol = self.exact[term]
+            scores[symbol] = max(scores.get(symbol, 0), similarity)
+        if not scores:
+            return None
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        symbol, similarity = ranked[0]
+        if similarity < FUZZY_MIN_SIMILARITY:
+            return None
+        # A close runner-up means the misspelling could be either coin
+        margin = similarity - ranked[1][1] if len(ranked) > 1 else similarity
+        confidence = min(1.0, 0.5 + similarity / 2) if margin >= 0.15 else similarity / 2
+        return Resolution(symbol, round(confidence, 3), "fuzzy")
+
+
+resolver = TickerResolver()
@@ -1,39 +1,71 @@
+import os
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from duckduckgo_search import DDGS
 from classes import *
 import openbb as obb
 import pandas_ta as ta
+import price_store
+from price_archive import archive_reader
+from bars import bar_views
+from cache import TTLCache
+from circuit_breaker import duckduckgo_breaker, openbb_breaker
+
+# M2 is published monthly, a day old series is fresh enough
+MACRO_CACHE_TTL = int(os.environ.get("MACRO_CACHE_TTL", 24 * 3600))
+MACRO_CACHE_STALE_TTL = int(os.environ.get("MACRO_CACHE_STALE_TTL", 30 * 24 * 3600))
+macro_cache = TTLCache(
+    "macro",
+    ttl=MACRO_CACHE_TTL,
+    stale_ttl=MACRO_CACHE_STALE_TTL,
+    snapshot=os.environ.get("MACRO_CACHE_SNAPSHOT", "1") == "1",
+)
+# Search results per keyword, snapshotted to disk so that all workers share them
+NEWS_CACHE_TTL = int(os.environ.get("NEWS_CACHE_TTL", 15 * 60))
+NEWS_CACHE_STALE_TTL = int(os.environ.get("NEWS_CACHE_STALE_TTL", 60 * 60))
+news_cache = TTLCache(
+    "news", ttl=NEWS_CACHE_TTL, stale_ttl=NEWS_CACHE_STALE_TTL, snapshot=True
+)
 
 
 def search(keyword: str, max_results=100) -> pd.DataFrame:
-    search_tool = DDGS()
-    results = search_tool.news(
-        keywords=keyword, safesearch="off", timelimit="m", max_results=max_results
+    # Failures fall back to the stale cache entry, if any, without waiting on DuckDuckGo
+    results = duckduckgo_breaker.call(
+        lambda: DDGS().news(keywords=keyword, safesearch="off", timelimit="m", max_results=max_results),
+        key=f"news:{keyword}",
     )
     df = pd.DataFrame.from_records(results)
     df["date"] = pd.to_datetime(df.date)
     return df.sort_values(by="date", ascending=False)
 
 
+def dedupe_news(df: pd.DataFrame) -> pd.DataFrame:
+    """Drops articles whose URL or normalised title was already seen, keeping the first one."""
+    if "url" in df.columns:
+        df = df[~(df["url"].notna() & df["url"].duplicated())]
+    titles = df["title"].str.lower().str.replace(r"\W+", " ", regex=True).str.strip()
+    return df[~titles.duplicated()]
+
+
+def cached_search(keyword: str) -> pd.DataFrame:
+    """Returns the deduplicated news for `keyword`, fetched at most once per NEWS_CACHE_TTL."""
+    return news_cache.get(keyword, lambda: dedupe_news(search(keyword=keyword)))
+
+
 def get_price_data(
     ticker: Ticker, time_frame: TimeFrame = TimeFrame.DAILY
 ) -> pd.DataFrame:
     try:
-        # print(f"ticker is {ticker.name}")
-        # print("name of ticker is" + ticker.name)
-        df = obb.obb.crypto.price.historical(
-            symbol=f"{ticker.name}USD", start_date="2010-01-01"
-        )
-        df["date"] = pd.to_datetime(df.index)
-        df["ticker"] = ticker.name
-        df = df[["date", "open", "high", "low", "close", "volume"]].set_index("date")
-        if time_frame == TimeFrame.DAILY:
+        # The archive writer keeps every timeframe up to date, workers only map it
+        df = archive_reader.read(ticker.name, time_frame)
+        if df is not None and not df.empty:
             return df
-
-        interval = "W" if time_frame == TimeFrame.WEEKLY else "M"
-        return df.resample(interval).agg(
-            {"high": "max", "low": "min", "close": "last", "volume": "sum"}
-        )
+        daily = archive_reader.read(ticker.name, TimeFrame.DAILY)
+        if daily is None:
+            daily = price_store.get_daily_bars(ticker.name)
+        if daily.empty:
+            raise ValueError("no price data stored or retrieved")
+        return bar_views.get(ticker.name, time_frame, daily)
     except Exception as e:
         print(f"Error getting price data for {ticker.name}: {e}")
         # Return empty DataFrame with expected columns
@@ -42,11 +74,15 @@ def get_price_data(
 
 def get_news_data(ticker: Ticker, max_articles_per_day: int = 5) -> pd.DataFrame:
     try:
-        crypto_news_df = search(keyword="Cryptocurrency")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            crypto_news = executor.submit(cached_search, "Cryptocurrency")
+            currency_news = executor.submit(cached_search, top_crypto_dict[ticker.name])
+            crypto_news_df = crypto_news.result().copy()
+            currency_news_df = currency_news.result().copy()
         crypto_news_df["ticker"] = None
-        currency_news_df = search(keyword=top_crypto_dict[ticker.name])
         currency_news_df["ticker"] = ticker.name
-        df = pd.concat([crypto_news_df, currency_news_df], axis=0)
+        # Coin specific articles come first so they win over the same generic article
+        df = dedupe_news(pd.concat([currency_news_df, crypto_news_df], axis=0))
         df = df.sort_values(by="date").reset_index(drop=True)
         return df
     except Exception as e:
@@ -55,13 +91,19 @@ def get_news_data(ticker: Ticker, max_articles_per_day: int = 5) -> pd.DataFrame
         return pd.DataFrame(columns=["date", "title", "body", "ticker"])
 
 
+def _fetch_money_supply() -> pd.DataFrame:
+    money_df = openbb_breaker.call(
+        lambda: obb.obb.economy.money_measures(start_date="2010-01-01"), key="money_supply"
+    )
+    money_df.month = pd.to_datetime(money_df.month)
+    money_df = money_df[["month", "M1", "M2"]]
+    money_df.columns = ["date", "m1", "m2"]
+    return money_df[["date", "m1", "m2"]].set_index("date")
+
+
 def get_money_supply() -> pd.DataFrame:
     try:
-        money_df = obb.obb.economy.money_measures(start_date="2010-01-01")
-        money_df.month = pd.to_datetime(money_df.month)
-        money_df = money_df[["month", "M1", "M2"]]
-        money_df.columns = ["date", "m1", "m2"]
-        return money_df[["date", "m1", "m2"]].set_index("date")
+        return macro_cache.get("money_supply", _fetch_money_supply)
     except Exception as e:
         print(f"Error getting money supply data: {e}")
         # Return empty DataFrame with expected columns
@@ -85,10 +127,11 @@ def add_indicators(data: pd.DataFrame) -> pd.DataFrame:
     data["ma_50"] = data["close"].rolling(50).mean()
     data["ma_200"] = data["close"].rolling(200).mean()
     data["rsi"] = ta.rsi(data["close"])
+    # pandas_ta orders the MACD columns as macd, histogram, signal
     data["macd"], data["macd_signal"], data["macd_histogram"] = (
         macd_df.iloc[:, 0],
-        macd_df.iloc[:, 1],
         macd_df.iloc[:, 2],
+        macd_df.iloc[:, 1],
     )
     data["bb_lower"], data["bb_middle"], data["bb_upper"] = (
         bbands_df.iloc[:, 0],